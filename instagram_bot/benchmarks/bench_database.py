@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Мікробенчмарк DatabaseManager: постійне з'єднання + WAL + черга записів
+проти старої поведінки "нове з'єднання на кожен виклик".
+
+Запуск:
+    python benchmarks/bench_database.py --ops 2000
+"""
+
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import DatabaseManager
+
+
+def legacy_log_action(db_path, account_username, action_type, target_username=None, success=True, details=None):
+    """Стара реалізація log_action: з'єднання та коміт на кожен виклик"""
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO actions (account_username, action_type, target_username, success, details)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (account_username, action_type, target_username, success, details))
+        conn.commit()
+
+
+def legacy_get_today_actions(db_path, account_username):
+    """Стара реалізація get_today_actions"""
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT action_type, COUNT(*) as count
+            FROM actions
+            WHERE account_username = ? AND DATE(timestamp) = DATE('now')
+            GROUP BY action_type
+        ''', (account_username,))
+        return dict(cursor.fetchall())
+
+
+def bench_legacy(db_path, ops):
+    """Замір старої поведінки"""
+    # Схема створюється менеджером, далі працюємо без нього
+    DatabaseManager(db_path).close()
+
+    # Стара БД працювала в режимі rollback journal
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('PRAGMA journal_mode=DELETE')
+
+    start = time.perf_counter()
+    for i in range(ops):
+        legacy_log_action(db_path, 'bench_user', 'like', f'target_{i}')
+        if i % 10 == 0:
+            legacy_get_today_actions(db_path, 'bench_user')
+    return time.perf_counter() - start
+
+
+def bench_manager(db_path, ops):
+    """Замір DatabaseManager з постійним з'єднанням"""
+    db = DatabaseManager(db_path)
+    try:
+        start = time.perf_counter()
+        for i in range(ops):
+            db.log_action('bench_user', 'like', f'target_{i}')
+            if i % 10 == 0:
+                db.get_today_actions('bench_user')
+        db.flush()
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк DatabaseManager")
+    parser.add_argument('--ops', type=int, default=2000, help='Кількість операцій')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        legacy_time = bench_legacy(str(Path(temp_dir) / "legacy.db"), args.ops)
+        manager_time = bench_manager(str(Path(temp_dir) / "manager.db"), args.ops)
+
+    legacy_rate = args.ops / legacy_time
+    manager_rate = args.ops / manager_time
+
+    print(f"📊 Операцій: {args.ops} (log_action + get_today_actions кожні 10)")
+    print(f"  • connect-per-call: {legacy_rate:10.0f} ops/sec ({legacy_time:.3f} сек)")
+    print(f"  • DatabaseManager:  {manager_rate:10.0f} ops/sec ({manager_time:.3f} сек)")
+    print(f"  • Прискорення:      {manager_rate / legacy_rate:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Headless бенчмарк конвеєра логів GUI: записів/сек у вікно логів.
+
+Порівнює стару схему (root.after + повне читання віджета на кожен запис)
+з чергою та пакетною обробкою InstagramBotGUI.process_log_queue.
+Якщо дисплей недоступний, використовується емуляція tk.Text.
+
+Запуск:
+    python benchmarks/bench_gui_log.py --records 20000
+"""
+
+import sys
+import time
+import queue
+import argparse
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gui import InstagramBotGUI
+
+
+class FakeText:
+    """Мінімальна емуляція tk.Text для рядкових індексів 'N.0' та tk.END"""
+
+    def __init__(self):
+        self.lines = ['']
+
+    def config(self, **kwargs):
+        pass
+
+    def insert(self, index, text):
+        parts = text.split('\n')
+        self.lines[-1] += parts[0]
+        self.lines.extend(parts[1:])
+
+    def get(self, start, end):
+        return '\n'.join(self.lines) + '\n'
+
+    def delete(self, start, end):
+        last_line = int(str(end).split('.')[0])
+        del self.lines[:last_line - 1]
+
+    def see(self, index):
+        pass
+
+
+class FakeVar:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class FakeRoot:
+    """Емуляція root.after: відкладені виклики виконуються в update(), як у Tk"""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay, callback=None):
+        if callback is not None:
+            self.pending.append(callback)
+
+    def update(self):
+        pending, self.pending = self.pending, []
+        for callback in pending:
+            callback()
+
+
+def make_text_widget():
+    """Справжній tk.Text, якщо є дисплей, інакше емуляція"""
+    try:
+        root = tk.Tk()
+        root.withdraw()
+        return root, tk.Text(root), "tk.Text"
+    except tk.TclError:
+        return FakeRoot(), FakeText(), "FakeText"
+
+
+def make_gui(root, text_widget):
+    """InstagramBotGUI без побудови всього інтерфейсу"""
+    gui = InstagramBotGUI.__new__(InstagramBotGUI)
+    gui.root = root
+    gui.logs_text = text_widget
+    gui.auto_scroll_var = FakeVar(True)
+    gui.log_queue = queue.Queue(maxsize=InstagramBotGUI.LOG_QUEUE_SIZE)
+    gui.log_line_count = 0
+    gui.dropped_log_records = 0
+    return gui
+
+
+def legacy_log_message(gui, message):
+    """Стара реалізація log_message"""
+    log_entry = f"[00:00:00] {message}\n"
+
+    gui.logs_text.config(state=tk.NORMAL)
+    gui.logs_text.insert(tk.END, log_entry)
+    if gui.auto_scroll_var.get():
+        gui.logs_text.see(tk.END)
+    gui.logs_text.config(state=tk.DISABLED)
+
+    lines = gui.logs_text.get(1.0, tk.END).split('\n')
+    if len(lines) > 1000:
+        gui.logs_text.config(state=tk.NORMAL)
+        gui.logs_text.delete(1.0, f"{len(lines)-1000}.0")
+        gui.logs_text.config(state=tk.DISABLED)
+
+
+def bench_legacy(records):
+    root, text_widget, _ = make_text_widget()
+    gui = make_gui(root, text_widget)
+
+    start = time.perf_counter()
+    for i in range(records):
+        message = f"2025-01-01 00:00:00 - INFO - Запис логу {i}"
+        # Старий обробник логів бота: окремий root.after на кожен запис
+        root.after(0, lambda message=message: legacy_log_message(gui, message))
+    root.update()
+    return time.perf_counter() - start
+
+
+def bench_queue(records):
+    root, text_widget, backend = make_text_widget()
+    gui = make_gui(root, text_widget)
+
+    start = time.perf_counter()
+    for i in range(records):
+        gui.log_message(f"2025-01-01 00:00:00 - INFO - Запис логу {i}")
+        # Емуляція таймера: обробка черги кожні LOG_BATCH_SIZE записів
+        if gui.log_queue.qsize() >= gui.LOG_BATCH_SIZE:
+            gui.process_log_queue()
+    while not gui.log_queue.empty():
+        gui.process_log_queue()
+    return time.perf_counter() - start, backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк логів GUI")
+    parser.add_argument('--records', type=int, default=20000, help='Кількість записів')
+    args = parser.parse_args()
+
+    legacy_time = bench_legacy(args.records)
+    queue_time, backend = bench_queue(args.records)
+
+    print(f"📊 Записів: {args.records} (віджет: {backend})")
+    print(f"  • root.after на запис: {args.records / legacy_time:10.0f} записів/сек")
+    print(f"  • черга + пакети:      {args.records / queue_time:10.0f} записів/сек")
+    print(f"  • Прискорення:         {legacy_time / queue_time:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
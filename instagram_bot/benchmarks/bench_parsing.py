@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк парсингу списків цільових користувачів на великому списку.
+
+Порівнює стару реалізацію parse_target_users (імпорт re і компіляція
+шаблону на кожного користувача) з target_parser, а також потоковий
+парсинг файлу і лічильник GUI при редагуванні одного рядка.
+
+Запуск:
+    python benchmarks/bench_parsing.py --lines 100000
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from target_parser import parse_usernames, parse_file, IncrementalTargetCounter
+
+
+def legacy_parse_target_users(target_input):
+    """Стара реалізація InstagramBotGui.parse_target_users (без логування)"""
+    if not target_input:
+        return []
+
+    separators = [',', ';', '\n', ' ']
+    users = [target_input]
+
+    for sep in separators:
+        if sep in target_input:
+            users = target_input.split(sep)
+            break
+
+    cleaned_users = []
+    for user in users:
+        user = user.strip().replace('@', '')
+        if user and len(user) > 0:
+            import re
+            if re.match("^[a-zA-Z0-9._]+$", user) and len(user) >= 1:
+                cleaned_users.append(user)
+
+    return cleaned_users
+
+
+def generate_lines(count, seed=42):
+    """Список з одним юзернеймом на рядок, частина з @ та невалідних"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.1:
+            lines.append(f"@user_{i}")
+        elif roll < 0.12:
+            lines.append(f"bad-user-{i}")
+        else:
+            lines.append(f"user.{i}")
+    return lines
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк парсингу користувачів")
+    parser.add_argument('--lines', type=int, default=100000, help='Кількість рядків')
+    args = parser.parse_args()
+
+    lines = generate_lines(args.lines)
+    text = '\n'.join(lines)
+
+    legacy_time, legacy_users = timed(legacy_parse_target_users, text)
+    shared_time, (shared_users, _) = timed(parse_usernames, text)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "targets.txt"
+        path.write_text(text, encoding='utf-8')
+        file_time, (file_users, _) = timed(parse_file, path)
+
+    counter = IncrementalTargetCounter()
+    first_count_time, _ = timed(counter.count, text)
+    edited = text + 'x'  # Редагування останнього рядка
+    edit_count_time, _ = timed(counter.count, edited)
+
+    print(f"📊 Рядків: {args.lines}")
+    print(f"  • стара реалізація:        {legacy_time * 1000:8.1f} мс ({len(legacy_users)} користувачів)")
+    print(f"  • target_parser (рядок):   {shared_time * 1000:8.1f} мс ({len(shared_users)} користувачів)")
+    print(f"  • target_parser (файл):    {file_time * 1000:8.1f} мс ({len(file_users)} користувачів)")
+    print(f"  • лічильник GUI, перший:   {first_count_time * 1000:8.1f} мс")
+    print(f"  • лічильник GUI, 1 рядок:  {edit_count_time * 1000:8.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
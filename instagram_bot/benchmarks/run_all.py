@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Офлайн набір бенчмарків: час і пам'ять по компонентах проти baseline.json.
+
+Браузер замінено на stub_driver.StubChrome, БД, логи та профілі пишуться
+в тимчасову директорію, мережа не потрібна. Для кожного компонента
+береться найкращий час з кількох повторів (найменш шумний) і пік пам'яті (tracemalloc)
+з окремого прогону. Перевищення baseline більше ніж на допуск -
+регресія (код виходу 1).
+
+Запуск:
+    python benchmarks/run_all.py
+    python benchmarks/run_all.py --only parse_target_users,database_writes
+    python benchmarks/run_all.py --update-baseline
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config
+import utils
+import instagram_bot
+from gui import InstagramBotGUI
+from persistence import atomic_write_json
+from bench_parsing import generate_lines
+from bench_gui_log import FakeRoot, FakeText, make_gui
+from stub_driver import StubChrome
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+
+def configure_sandbox(temp_dir):
+    """Усі файли бота - у тимчасовій директорії, консольний вивід логів відкидається
+
+    Повертає потік-приймач консольного StreamHandler (закривається після shutdown_logging)
+    """
+    temp_dir = Path(temp_dir)
+    Config.DATABASE["path"] = str(temp_dir / "bench.db")
+    Config.DATABASE["retention"]["enabled"] = False
+    Config.LOGS_DIR = temp_dir / "logs"
+    Config.PROFILING["output_dir"] = str(temp_dir / "profiles")
+    Config.REPORTING["export_path"] = str(temp_dir / "reports")
+
+    # Ліміти не повинні зупиняти бенчмарк посередині
+    for key in ("max_actions_per_hour", "max_actions_per_day",
+                "max_users_per_hour", "max_users_per_session"):
+        Config.SECURITY[key] = 10 ** 9
+    for key in ("MAX_USERS_PER_SESSION", "MAX_USERS_PER_DAY", "MAX_LIKES_PER_SESSION"):
+        setattr(Config, key, 10 ** 9)
+
+    null_stream = open(os.devnull, 'w')
+    with contextlib.redirect_stderr(null_stream):
+        utils.setup_logging()
+    return null_stream
+
+
+def quiet_bot(username="bench_account"):
+    """Бот без затримок; логер пише лише помилки, щоб не міряти логування двічі"""
+    bot = instagram_bot.InstagramBotGui(username, "password")
+    bot.human_like_delay = lambda *args, **kwargs: None
+    bot.logger.setLevel("ERROR")
+    return bot
+
+
+# === Компоненти ===
+
+def bench_parse_target_users(size):
+    """InstagramBotGui.parse_target_users на списку з size рядків"""
+    bot = quiet_bot()
+    text = '\n'.join(generate_lines(size))
+
+    def run():
+        bot.parse_target_users(text)
+    return run
+
+
+def bench_database_writes(size):
+    """DatabaseManager: log_action + increment_statistics + record_target до коміту"""
+    db = utils.DatabaseManager()
+
+    def run():
+        for i in range(size):
+            db.log_action('bench_account', 'like', f'target_{i}')
+            db.increment_statistics('bench_account', likes=1)
+            db.record_target('bench_account', f'target_{i % 100}', True)
+        db.flush()
+    return run
+
+
+def bench_quota_engine(size):
+    """QuotaEngine.reserve + commit (перевірка лімітів + запис у actions/statistics)"""
+    db = utils.DatabaseManager()
+    quota = utils.QuotaEngine('bench_account', db)
+
+    def run():
+        for _ in range(size):
+            if quota.reserve('like'):
+                quota.commit('like', True, 'target')
+        db.flush()
+    return run
+
+
+def bench_log_handling(size):
+    """Записи акаунт-логера через QueueHandler до запису у файли"""
+    logger = utils.get_account_logger('bench_logs')
+    listener = utils.setup_logging()
+
+    def run():
+        for i in range(size):
+            logger.info(f"❤️ Лайк поста {i} користувача target_{i}")
+        # Слухач позначає кожен оброблений запис (task_done) - чекаємо порожню чергу
+        listener.queue.join()
+        for handler in listener.handlers:
+            handler.flush()
+    return run
+
+
+def bench_gui_log_trimming(size):
+    """Черга логів GUI з обрізанням до MAX_LOG_LINES (емуляція tk.Text)"""
+    def run():
+        gui = make_gui(FakeRoot(), FakeText())
+        for i in range(size):
+            gui.log_message(f"2025-01-01 00:00:00 - INFO - Запис логу {i}")
+            if gui.log_queue.qsize() >= InstagramBotGUI.LOG_BATCH_SIZE:
+                gui.process_log_queue()
+        while not gui.log_queue.empty():
+            gui.process_log_queue()
+    return run
+
+
+def bench_stub_driver_run(size):
+    """Повний цикл run_single_user_automation на StubChrome (без затримок)"""
+    bot = quiet_bot()
+    with mock.patch.object(instagram_bot.webdriver, "Chrome", StubChrome):
+        bot.setup_driver()
+    bot.start_quota_session()
+
+    def run():
+        bot.profiler.reset()
+        for i in range(size):
+            bot.run_single_user_automation(f"target_{i}", ["Nice!"])
+        bot.db.flush()
+    return run
+
+
+COMPONENTS = {
+    "parse_target_users": (bench_parse_target_users, 20000),
+    "database_writes": (bench_database_writes, 2000),
+    "quota_engine": (bench_quota_engine, 2000),
+    "log_handling": (bench_log_handling, 5000),
+    "gui_log_trimming": (bench_gui_log_trimming, 5000),
+    "stub_driver_run": (bench_stub_driver_run, 20),
+}
+
+
+# === Вимірювання ===
+
+def measure(factory, size, repeats):
+    """Найкращий час з repeats прогонів та пік пам'яті окремого прогону"""
+    run = factory(size)
+    run()  # Розігрів: кеші регулярних виразів, підготовлені оператори SQLite
+
+    # Як у timeit: збирач сміття не втручається в заміри
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "size": size,
+        "time_ms": round(min(timings) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1)
+    }
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """Рядки звіту та список регресій відносно baseline"""
+    lines = [f"{'компонент':<20} {'час, мс':>10} {'baseline':>10} {'Δ':>8}   "
+             f"{'пам., КБ':>10} {'baseline':>10} {'Δ':>8}"]
+    regressions = []
+
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or base.get("size") != result["size"]:
+            lines.append(f"{name:<20} {result['time_ms']:>10.1f} {'-':>10} {'':>8}   "
+                         f"{result['peak_kb']:>10.1f} {'-':>10}")
+            continue
+
+        time_delta = result["time_ms"] / base["time_ms"] - 1 if base["time_ms"] else 0.0
+        memory_delta = result["peak_kb"] / base["peak_kb"] - 1 if base["peak_kb"] else 0.0
+        flags = []
+        if time_delta > time_tolerance:
+            flags.append("час")
+        if memory_delta > memory_tolerance:
+            flags.append("пам'ять")
+        if flags:
+            regressions.append(f"{name}: {', '.join(flags)}")
+
+        lines.append(
+            f"{name:<20} {result['time_ms']:>10.1f} {base['time_ms']:>10.1f} {time_delta:>+8.0%}   "
+            f"{result['peak_kb']:>10.1f} {base['peak_kb']:>10.1f} {memory_delta:>+8.0%}"
+            + ("  ⚠️" if flags else "")
+        )
+
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Офлайн бенчмарки компонентів бота")
+    parser.add_argument('--only', type=str, help='Компоненти через кому')
+    parser.add_argument('--repeats', type=int, default=7, help='Повторів на компонент')
+    parser.add_argument('--baseline', type=str, default=str(BASELINE_PATH), help='Файл baseline')
+    parser.add_argument('--update-baseline', action='store_true', help='Записати результати як baseline')
+    # Час на спільних машинах шумить на десятки відсотків; ловимо кратні уповільнення
+    parser.add_argument('--time-tolerance', type=float, default=1.0,
+                        help='Допустиме уповільнення (1.0 = +100%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.25,
+                        help='Допустиме зростання піку пам\'яті (0.25 = +25%%)')
+    parser.add_argument('--json', type=str, help='Зберегти результати в JSON')
+    args = parser.parse_args()
+
+    names = list(COMPONENTS)
+    if args.only:
+        names = [name.strip() for name in args.only.split(',') if name.strip()]
+        unknown = [name for name in names if name not in COMPONENTS]
+        if unknown:
+            parser.error(f"Невідомі компоненти: {', '.join(unknown)}")
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get("components", {})
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        null_stream = configure_sandbox(temp_dir)
+        try:
+            for name in names:
+                factory, size = COMPONENTS[name]
+                results[name] = measure(factory, size, args.repeats)
+        finally:
+            utils.shutdown_logging()
+            null_stream.close()
+
+    lines, regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    print(f"📊 Офлайн бенчмарки (найкращий з {args.repeats}, Python {sys.version.split()[0]})")
+    for line in lines:
+        print(f"  {line}")
+
+    document = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "components": results
+    }
+    if args.json:
+        atomic_write_json(args.json, document)
+
+    if args.update_baseline:
+        if args.only and baseline:
+            document["components"] = dict(baseline, **results)
+        atomic_write_json(baseline_path, document)
+        print(f"💾 Baseline оновлено: {baseline_path}")
+        return 0
+
+    if regressions:
+        print("❌ Регресії: " + "; ".join(regressions))
+        return 1
+
+    print("✅ Регресій немає" if baseline else "ℹ️ Baseline відсутній - запустіть з --update-baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
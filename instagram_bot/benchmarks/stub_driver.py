@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stub замість webdriver.Chrome для офлайн бенчмарків: без браузера та мережі.
+
+Повертає "видимі" елементи на будь-який селектор, тож сценарії бота
+(пости → лайк → сторіс → відповідь) проходять повністю і вимірюється
+лише локальна робота: логування, профайлер, квоти, записи в БД.
+"""
+
+
+class StubElement:
+    """Елемент сторінки з мінімальним API WebElement"""
+
+    tag_name = "button"
+
+    def __init__(self, driver, selector=None, index=0):
+        self._driver = driver
+        self._selector = selector or ""
+        self._index = index
+        self.text = ""
+
+    def get_attribute(self, name):
+        if name == "href":
+            return f"https://www.instagram.com/p/stub{self._index}/"
+        if name == "aria-label":
+            return "Like"
+        return None
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self._driver.clicks += 1
+
+    def clear(self):
+        self.text = ""
+
+    def send_keys(self, *values):
+        self.text += "".join(str(value) for value in values)
+
+    def find_element(self, by=None, value=None):
+        return StubElement(self._driver, value)
+
+    def find_elements(self, by=None, value=None):
+        return [StubElement(self._driver, value)]
+
+
+class StubChrome:
+    """Заміна webdriver.Chrome(options=...) з лічильниками викликів"""
+
+    def __init__(self, *args, elements_per_query=3, **kwargs):
+        self.elements_per_query = elements_per_query
+        self.current_url = "about:blank"
+        self.page_source = "<html></html>"
+        self.title = ""
+        self.requests = 0
+        self.clicks = 0
+
+    def get(self, url):
+        self.requests += 1
+        self.current_url = url
+
+    def find_element(self, by=None, value=None):
+        return StubElement(self, value)
+
+    def find_elements(self, by=None, value=None):
+        return [StubElement(self, value, index) for index in range(self.elements_per_query)]
+
+    def execute_script(self, script, *args):
+        return None
+
+    def set_window_size(self, width, height):
+        pass
+
+    def get_cookies(self):
+        return []
+
+    def quit(self):
+        pass
@@ -1,6 +1,8 @@
 import os
 import json
 from pathlib import Path
+from persistence import atomic_write_json, get_store
+from target_parser import parse_usernames, validate_username
 
 class Config:
     """Конфігурація бота з підтримкою багатьох користувачів"""
@@ -36,6 +38,9 @@ class Config:
     MAX_FOLLOWS_PER_SESSION = 20
     DEFAULT_POSTS_COUNT = 2        # Кількість постів для лайку за замовчуванням
     
+    # Затримка об'єднання частих записів JSON файлів (секунди)
+    PERSISTENCE_DELAY = 0.5
+    
     # Шляхи до файлів
     BASE_DIR = Path(__file__).parent
     LOGS_DIR = BASE_DIR / "logs"
@@ -277,7 +282,17 @@ class Config:
     DATABASE = {
         "type": "sqlite",
         "path": str(DATA_DIR / "instagram_bot_multi.db"),
-        "backup_frequency": 24  # годин
+        "backup_frequency": 24,  # годин
+        
+        # Очищення старих дій за розкладом
+        "retention": {
+            "enabled": True,
+            "days": 30,               # Скільки днів зберігати сирі дії
+            "interval_hours": 24,     # Як часто запускати очищення
+            "batch_size": 500,        # Рядків за одну транзакцію
+            "batch_pause": 0.05,      # Пауза між пакетами (секунди)
+            "statistics_days": 90     # Денна статистика старша за N днів згортається по місяцях
+        }
     }
     
     # Налаштування сесій
@@ -319,10 +334,19 @@ class Config:
         
         # Додаткові налаштування для багатьох користувачів
         "multi_user_format": "%(asctime)s - [USER: %(user)s] - %(levelname)s - %(message)s",
-        "separate_user_logs": False,  # Окремі файли для кожного користувача
+        "rotation_when": None,  # Ротація за часом ("midnight", "H"), None - за розміром
+        "separate_user_logs": True,  # Окремі файли для кожного користувача
         "progress_logging": True
     }
     
+    # Профілювання прогонів (час кроків, завантажень сторінок, WebDriver, затримок)
+    PROFILING = {
+        "enabled": True,
+        "formats": ["json", "csv"],
+        "output_dir": str(LOGS_DIR / "profiles"),
+        "report_top": 10  # Рядків у звіті в логах
+    }
+    
     # Налаштування GUI
     GUI = {
         "theme": "dark",
@@ -444,8 +468,7 @@ class Config:
                 "REPORTING": cls.REPORTING
             }
             
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
+            atomic_write_json(config_file, config_data)
                 
         except Exception as e:
             print(f"Помилка при збереженні конфігурації: {e}")
@@ -471,68 +494,37 @@ class Config:
             return random.choice(cls.PROXY_SERVERS)
         return None
         
+    @classmethod
+    def get_username_validation_options(cls):
+        """Параметри валідації юзернеймів для target_parser"""
+        validation = cls.USER_VALIDATION
+        return {
+            "min_length": validation["min_username_length"],
+            "max_length": validation["max_username_length"],
+            "allowed_characters": validation["allowed_characters"],
+            "remove_at_symbol": validation["remove_at_symbol"]
+        }
+        
+    @classmethod
+    def get_users_parse_options(cls):
+        """Параметри парсингу списків користувачів для target_parser"""
+        options = cls.get_username_validation_options()
+        options["lowercase"] = not cls.USER_VALIDATION["case_sensitive"]
+        options["remove_duplicates"] = cls.USER_VALIDATION["remove_duplicates"]
+        return options
+        
     @classmethod
     def validate_username(cls, username):
         """Валідація юзернейму"""
-        if not username:
-            return False, "Порожній юзернейм"
-            
-        # Видалення символу @
-        if cls.USER_VALIDATION["remove_at_symbol"]:
-            username = username.lstrip('@')
-            
-        # Перевірка довжини
-        if len(username) < cls.USER_VALIDATION["min_username_length"]:
-            return False, f"Занадто короткий (мін. {cls.USER_VALIDATION['min_username_length']})"
-            
-        if len(username) > cls.USER_VALIDATION["max_username_length"]:
-            return False, f"Занадто довгий (макс. {cls.USER_VALIDATION['max_username_length']})"
-            
-        # Перевірка дозволених символів
-        allowed = cls.USER_VALIDATION["allowed_characters"]
-        for char in username:
-            if char not in allowed:
-                return False, f"Недозволений символ: {char}"
-                
-        return True, username
+        return validate_username(username, **cls.get_username_validation_options())
         
     @classmethod
     def parse_users_input(cls, users_input):
         """Парсинг введення користувачів з валідацією"""
         if not users_input:
-            return []
+            return [], []
             
-        # Різні варіанти розділювачів
-        separators = [',', ';', '\n', '\t', ' ']
-        users = [users_input]
-        
-        for sep in separators:
-            if sep in users_input:
-                users = users_input.split(sep)
-                break
-        
-        # Очищення та валідація
-        validated_users = []
-        errors = []
-        
-        for user in users:
-            user = user.strip()
-            if not user:
-                continue
-                
-            is_valid, result = cls.validate_username(user)
-            if is_valid:
-                if not cls.USER_VALIDATION["case_sensitive"]:
-                    result = result.lower()
-                validated_users.append(result)
-            else:
-                errors.append(f"{user}: {result}")
-        
-        # Видалення дублікатів
-        if cls.USER_VALIDATION["remove_duplicates"]:
-            validated_users = list(dict.fromkeys(validated_users))
-            
-        return validated_users, errors
+        return parse_usernames(users_input, **cls.get_users_parse_options())
         
     @classmethod
     def get_user_delay(cls):
@@ -615,9 +607,7 @@ class Config:
             export_path.mkdir(exist_ok=True)
             
             filename = export_path / f"{username}_stats.json"
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(stats, f, indent=2, ensure_ascii=False)
+            atomic_write_json(filename, stats)
                 
             return True
             
@@ -625,15 +615,17 @@ class Config:
             print(f"Помилка експорту статистики для {username}: {e}")
             return False
             
+    @classmethod
+    def _users_lists_store(cls):
+        """Кешоване сховище збережених списків користувачів"""
+        return get_store(cls.DATA_DIR / "saved_user_lists.json",
+                         delay=cls.PERSISTENCE_DELAY, backup=True)
+            
     @classmethod
     def load_saved_users_lists(cls):
         """Завантаження збережених списків користувачів"""
         try:
-            lists_file = cls.DATA_DIR / "saved_user_lists.json"
-            if lists_file.exists():
-                with open(lists_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
+            return dict(cls._users_lists_store().load())
         except Exception:
             return {}
             
@@ -641,8 +633,8 @@ class Config:
     def save_users_list(cls, list_name, users_list):
         """Збереження списку користувачів"""
         try:
-            lists_file = cls.DATA_DIR / "saved_user_lists.json"
-            saved_lists = cls.load_saved_users_lists()
+            store = cls._users_lists_store()
+            saved_lists = store.load()
             
             saved_lists[list_name] = {
                 "users": users_list,
@@ -650,8 +642,7 @@ class Config:
                 "count": len(users_list)
             }
             
-            with open(lists_file, 'w', encoding='utf-8') as f:
-                json.dump(saved_lists, f, indent=2, ensure_ascii=False)
+            store.save(saved_lists)
                 
             return True
         except Exception as e:
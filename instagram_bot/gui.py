@@ -1,12 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 import threading
+import queue
 import json
 import os
 from datetime import datetime
 import logging
+from persistence import atomic_write_json
+from config import Config
+from target_parser import parse_usernames, parse_file, IncrementalTargetCounter
 
 class InstagramBotGUI:
+    # Налаштування конвеєра логів
+    MAX_LOG_LINES = 1000        # Максимум рядків у вікні логів
+    LOG_QUEUE_SIZE = 5000       # Розмір черги записів (найстаріші відкидаються)
+    LOG_FLUSH_INTERVAL = 100    # Інтервал обробки черги (мс)
+    LOG_BATCH_SIZE = 500        # Максимум записів за одну обробку
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Instagram Bot - Багато користувачів з багаторядковими повідомленнями")
@@ -20,9 +30,19 @@ class InstagramBotGUI:
         self.bots = {}
         self.running_bots = set()
         
+        # Черга логів: потоки ботів лише додають записи, вікно оновлюється пакетами
+        self.log_queue = queue.Queue(maxsize=self.LOG_QUEUE_SIZE)
+        self.log_line_count = 0
+        self.dropped_log_records = 0
+        
+        # Лічильник користувачів, що перепарсює лише змінені рядки
+        self.targets_counter = IncrementalTargetCounter(**Config.get_users_parse_options())
+        
         # Створення інтерфейсу
         self.create_widgets()
         
+        self.root.after(self.LOG_FLUSH_INTERVAL, self.process_log_queue)
+        
     def setup_style(self):
         """Налаштування стилю"""
         style = ttk.Style()
@@ -129,7 +149,8 @@ class InstagramBotGUI:
 • Через крапку з комою: user1; user2; user3  
 • Кожен з нового рядка
 • Через пробіл: user1 user2 user3
-• З символом @: @user1, @user2 (символ @ буде видалений автоматично)"""
+• З символом @: @user1, @user2 (символ @ буде видалений автоматично)
+• Розділювачі можна змішувати, дублікати видаляються"""
         
         instructions_label = tk.Label(instructions_frame, text=instructions_text, 
                                      justify=tk.LEFT, bg=self.colors['bg'], fg='lightgray',
@@ -463,8 +484,7 @@ class InstagramBotGUI:
     def save_messages(self):
         """Збереження повідомлень"""
         try:
-            with open('multiline_messages.json', 'w', encoding='utf-8') as f:
-                json.dump(self.original_messages, f, indent=2, ensure_ascii=False)
+            atomic_write_json('multiline_messages.json', self.original_messages)
         except Exception as e:
             messagebox.showerror("Помилка", f"Не вдалося зберегти повідомлення: {e}")
             
@@ -663,12 +683,8 @@ class InstagramBotGUI:
     def update_targets_count(self, event=None):
         """Оновлення лічильника користувачів"""
         try:
-            content = self.targets_text.get('1.0', tk.END).strip()
-            if not content:
-                count = 0
-            else:
-                users = self.parse_targets(content)
-                count = len(users)
+            content = self.targets_text.get('1.0', tk.END)
+            count = self.targets_counter.count(content)
             
             self.targets_count_var.set(f"Користувачів: {count}")
         except Exception:
@@ -679,23 +695,7 @@ class InstagramBotGUI:
         if not content:
             return []
         
-        separators = [',', ';', '\n', ' ']
-        users = [content]
-        
-        for sep in separators:
-            if sep in content:
-                users = content.split(sep)
-                break
-        
-        cleaned_users = []
-        for user in users:
-            user = user.strip().replace('@', '')
-            if user and len(user) > 0:
-                import re
-                if re.match("^[a-zA-Z0-9._]+$", user) and len(user) >= 1:
-                    cleaned_users.append(user)
-        
-        return cleaned_users
+        return parse_usernames(content, **Config.get_users_parse_options())[0]
         
     def update_actions_summary(self):
         """Оновлення резюме дій"""
@@ -845,8 +845,10 @@ class InstagramBotGUI:
                 self.gui = gui_instance
                 
             def emit(self, record):
-                log_entry = self.format(record)
-                self.gui.root.after(0, lambda: self.gui.log_message(log_entry))
+                try:
+                    self.gui.log_message(self.format(record))
+                except Exception:
+                    self.handleError(record)
                 
         gui_handler = GUILogHandler(self)
         gui_handler.setLevel(logging.INFO)
@@ -872,30 +874,88 @@ class InstagramBotGUI:
             self.log_message("⏹️ Автоматизацію зупинено користувачем")
 
     def log_message(self, message):
-        """Додавання повідомлення до логів"""
+        """Додавання повідомлення до черги логів (безпечно з будь-якого потоку)"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        log_entry = f"[{timestamp}] {message}\n"
+        
+        while True:
+            try:
+                self.log_queue.put_nowait(log_entry)
+                return
+            except queue.Full:
+                # Черга переповнена - відкидаємо найстаріший запис
+                try:
+                    self.log_queue.get_nowait()
+                    self.dropped_log_records += 1
+                except queue.Empty:
+                    pass
+                    
+    def process_log_queue(self):
+        """Пакетне перенесення записів з черги у вікно логів"""
         try:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            log_entry = f"[{timestamp}] {message}\n"
-            
-            self.logs_text.config(state=tk.NORMAL)
-            self.logs_text.insert(tk.END, log_entry)
-            
-            if self.auto_scroll_var.get():
-                self.logs_text.see(tk.END)
+            entries = []
+            while len(entries) < self.LOG_BATCH_SIZE:
+                try:
+                    entries.append(self.log_queue.get_nowait())
+                except queue.Empty:
+                    break
+                    
+            if self.dropped_log_records:
+                dropped = self.dropped_log_records
+                self.dropped_log_records = 0
+                entries.insert(0, f"[...] Пропущено {dropped} записів логу (черга переповнена)\n")
                 
-            self.logs_text.config(state=tk.DISABLED)
-            
-            lines = self.logs_text.get(1.0, tk.END).split('\n')
-            if len(lines) > 1000:
-                self.logs_text.config(state=tk.NORMAL)
-                self.logs_text.delete(1.0, f"{len(lines)-1000}.0")
-                self.logs_text.config(state=tk.DISABLED)
+            if entries:
+                self.append_log_entries(entries)
                 
         except Exception as e:
             print(f"Помилка логування: {e}")
+        finally:
+            self.root.after(self.LOG_FLUSH_INTERVAL, self.process_log_queue)
+            
+    def append_log_entries(self, entries):
+        """Додавання пакету записів з обрізанням до MAX_LOG_LINES"""
+        text = "".join(entries)
+        
+        self.logs_text.config(state=tk.NORMAL)
+        self.logs_text.insert(tk.END, text)
+        self.log_line_count += text.count('\n')
+        
+        # Обрізання за лічильником, без повторного читання всього віджета
+        excess = self.log_line_count - self.MAX_LOG_LINES
+        if excess > 0:
+            self.logs_text.delete('1.0', f"{excess + 1}.0")
+            self.log_line_count -= excess
+            
+        self.logs_text.config(state=tk.DISABLED)
+        
+        if self.auto_scroll_var.get():
+            self.logs_text.see(tk.END)
 
     # === ЗАГЛУШКИ ДЛЯ ІНШИХ МЕТОДІВ ===
-    def load_targets_from_file(self): pass
+    def load_targets_from_file(self):
+        """Завантаження користувачів з файлу (потоковий парсинг)"""
+        filename = filedialog.askopenfilename(
+            title="Завантажити користувачів",
+            filetypes=[("Text files", "*.txt"), ("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        
+        if filename:
+            try:
+                users, errors = parse_file(filename, **Config.get_users_parse_options())
+                
+                self.targets_text.delete('1.0', tk.END)
+                self.targets_text.insert('1.0', '\n'.join(users))
+                self.update_targets_count()
+                
+                result_msg = f"Завантажено {len(users)} користувачів!"
+                if errors:
+                    result_msg += f"\nПропущено невалідних: {len(errors)}"
+                messagebox.showinfo("Успіх", result_msg)
+                
+            except Exception as e:
+                messagebox.showerror("Помилка", f"Не вдалося завантажити файл: {e}")
+                
     def save_targets_to_file(self): pass  
     def clear_targets(self): pass
     def save_current_account(self): pass
@@ -1,6 +1,6 @@
 import time
 import random
-import logging
+from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -10,7 +10,9 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from config import Config
-from utils import AntiDetection
+from utils import AntiDetection, DatabaseManager, QuotaEngine, get_account_logger
+from target_parser import parse_usernames, validate_username
+from profiling import RunProfiler, InstrumentedDriver, timed_step, CATEGORY_SLEEP
 
 class InstagramBotGui:
     def __init__(self, username, password, proxy=None):
@@ -20,19 +22,46 @@ class InstagramBotGui:
         self.driver = None
         self.logged_in = False
         self.anti_detection = AntiDetection()
+        self.profiler = RunProfiler(username)
+        self.db = None
+        self.quota = None
         self.setup_logging()
         
+    def start_quota_session(self):
+        """Нова сесія для лімітів (денні та погодинні лічильники зберігаються)"""
+        if self.quota is None:
+            self.db = self.db or DatabaseManager()
+            self.quota = QuotaEngine(self.username, self.db)
+        self.quota.reset_session()
+        
+    def reserve_quota(self, action):
+        """Резерв квоти перед дією; False - ліміт вичерпано, дію слід пропустити"""
+        if self.quota is None:
+            self.start_quota_session()
+        if self.quota.reserve(action):
+            return True
+        self.logger.warning(f"⛔ Досягнуто {self.quota.exhausted} - дію '{action}' пропущено")
+        return False
+        
+    def commit_quota(self, action, success, target_username=None):
+        """Фіксація фактичного результату зарезервованої дії"""
+        self.quota.commit(action, success, target_username)
+        
+    def finish_target(self, target_username, success):
+        """Облік обробленого користувача; True - обробку перервав ліміт (користувач пропущений)"""
+        limited = not success and self.quota_exhausted()
+        self.commit_quota('user', not limited, target_username)
+        if not limited:
+            self.db.record_target(self.username, target_username, success)
+        return limited
+        
+    def quota_exhausted(self):
+        """Чи вичерпано бюджет у поточній сесії"""
+        return self.quota is not None and self.quota.exhausted is not None
+        
     def setup_logging(self):
-        """Налаштування логування"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(f'logs/{self.username}_bot.log'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(f'InstagramBot_{self.username}')
+        """Налаштування логування (спільна конфігурація з utils)"""
+        self.logger = get_account_logger(self.username)
         
     def setup_driver(self):
         """Налаштування веб-драйвера з обходом детекції"""
@@ -64,6 +93,10 @@ class InstagramBotGui:
             
         self.driver = webdriver.Chrome(options=chrome_options)
         
+        # Замір driver.get / find_elements для профілю прогону
+        if Config.PROFILING.get("enabled", True):
+            self.driver = InstrumentedDriver(self.driver, self.profiler)
+        
         # Приховування webdriver
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
@@ -73,7 +106,8 @@ class InstagramBotGui:
     def human_like_delay(self, min_delay=1, max_delay=3):
         """Затримка з імітацією людської поведінки"""
         delay = random.uniform(min_delay, max_delay)
-        time.sleep(delay)
+        with self.profiler.span("human_like_delay", CATEGORY_SLEEP):
+            time.sleep(delay)
         
     def fast_typing(self, element, text):
         """Швидке введення тексту для повідомлень з підтримкою багаторядкових повідомлень"""
@@ -149,8 +183,7 @@ class InstagramBotGui:
             return False
             
         # Перевірка на недопустимі символи
-        import re
-        if not re.match("^[a-zA-Z0-9._]+$", self.username):
+        if not validate_username(self.username, remove_at_symbol=False)[0]:
             self.logger.error("Логін містить недопустимі символи")
             return False
             
@@ -163,26 +196,9 @@ class InstagramBotGui:
         if not target_input:
             return []
         
-        # Різні варіанти розділювачів
-        separators = [',', ';', '\n', ' ']
-        users = [target_input]
-        
-        for sep in separators:
-            if sep in target_input:
-                users = target_input.split(sep)
-                break
-        
-        # Очищення та фільтрація
-        cleaned_users = []
-        for user in users:
-            user = user.strip().replace('@', '')  # Видаляємо @ якщо є
-            if user and len(user) > 0:
-                # Перевірка на валідність юзернейму Instagram
-                import re
-                if re.match("^[a-zA-Z0-9._]+$", user) and len(user) >= 1:
-                    cleaned_users.append(user)
-                else:
-                    self.logger.warning(f"Невалідний юзернейм: {user}")
+        cleaned_users, errors = parse_usernames(target_input, **Config.get_users_parse_options())
+        for error in errors:
+            self.logger.warning(f"Невалідний юзернейм: {error}")
         
         self.logger.info(f"Знайдено {len(cleaned_users)} валідних користувачів: {cleaned_users}")
         return cleaned_users
@@ -758,6 +774,7 @@ class InstagramBotGui:
         except:
             pass
 
+    @timed_step()
     def like_recent_posts(self, target_username, count=2):
         """Лайк останніх постів: профіль → пост1 → лайк → назад → пост2 → лайк → назад"""
         try:
@@ -850,8 +867,11 @@ class InstagramBotGui:
                         
                         if 'Unlike' in aria_label or 'Не подобається' in aria_label:
                             self.logger.info(f"ℹ️ Пост {i+1} вже лайкнутий, пропускаємо")
+                        elif not self.reserve_quota('like'):
+                            break
                         else:
                             # Спроба лайку
+                            liked_before = liked_count
                             try:
                                 parent_button = like_button.find_element(By.XPATH, "./ancestor::*[@role='button' or @tabindex='0'][1]")
                                 parent_button.click()
@@ -864,6 +884,7 @@ class InstagramBotGui:
                                     liked_count += 1
                                 except:
                                     self.logger.warning(f"❌ Не вдалося поставити лайк на пост {i+1}")
+                            self.commit_quota('like', liked_count > liked_before, target_username)
                         
                         # Затримка після лайка
                         self.human_like_delay(2, 4)
@@ -952,7 +973,14 @@ class InstagramBotGui:
                         EC.presence_of_element_located((By.CSS_SELECTOR, selector))
                     )
                     if 'Unlike' not in (like_button.get_attribute('aria-label') or ''):
-                        like_button.click()
+                        if not self.reserve_quota('story_like'):
+                            break
+                        try:
+                            like_button.click()
+                        except Exception:
+                            self.commit_quota('story_like', False, target_username)
+                            raise
+                        self.commit_quota('story_like', True, target_username)
                         story_liked = True
                         self.logger.info("❤️ Поставлено лайк сторіс")
                         break
@@ -964,6 +992,7 @@ class InstagramBotGui:
 
             # 5. ШВИДКА відповідь на сторіс (одразу після лайку)
             story_replied = False
+            reply_reserved = False
             reply_selectors = [
                 "textarea[placeholder*='Send message']",
                 "textarea[placeholder*='Reply']",
@@ -976,6 +1005,9 @@ class InstagramBotGui:
                     reply_input = WebDriverWait(self.driver, 3).until(  # Зменшено час очікування
                         EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                     )
+                    if not self.reserve_quota('story_reply'):
+                        break
+                    reply_reserved = True
                     message = random.choice(messages)
                     reply_input.clear()
                     self.anti_detection.human_typing(reply_input, message)
@@ -1061,12 +1093,17 @@ class InstagramBotGui:
                         self.logger.info("📤 Відправлено через Ctrl+Enter")
                     
                     story_replied = True
+                    self.commit_quota('story_reply', True, target_username)
+                    reply_reserved = False
                     self.logger.info(f"✅ Відправлено відповідь на сторіс: {message}")
                     self.human_like_delay(1, 2)  # Коротка затримка після відправки
                     break
                     
                 except Exception as e:
                     self.logger.debug(f"Помилка при відправці відповіді через селектор {selector}: {e}")
+                    if reply_reserved:
+                        self.commit_quota('story_reply', False, target_username)
+                        reply_reserved = False
                     continue
 
             if not story_replied:
@@ -1124,8 +1161,21 @@ class InstagramBotGui:
             self.logger.error(f"❌ Помилка при закритті сторіс: {e}")
             return False
 
+    @timed_step()
     def send_direct_message(self, target_username, messages):
-     """Fallback: якщо сторіс немає → Direct Messages → Next → повідомлення"""
+        """Fallback: якщо сторіс немає → Direct Messages → Next → повідомлення"""
+        if not self.reserve_quota('direct_message'):
+            return False
+            
+        sent = False
+        try:
+            sent = self._send_direct_message(target_username, messages)
+            return sent
+        finally:
+            self.commit_quota('direct_message', sent, target_username)
+
+    def _send_direct_message(self, target_username, messages):
+     """Відправка Direct Message (квоту резервує send_direct_message)"""
      try:
         self.logger.info(f"💬 Відправка Direct Message для {target_username}")
         
@@ -1354,6 +1404,7 @@ class InstagramBotGui:
     # === НОВИЙ МЕТОД: БАГАТОКОРИСТУВАЦЬКА АВТОМАТИЗАЦІЯ ===
     def run_automation_multiple_users(self, target_users_input, messages, actions_config=None):
         """Запуск автоматизації для багатьох користувачів ПОСЛІДОВНО"""
+        self.profiler.reset()
         try:
             self.logger.info(f"🚀 Початок багатокористувацької автоматизації")
             
@@ -1382,6 +1433,8 @@ class InstagramBotGui:
             total_users = len(target_users)
             successful_users = 0
             failed_users = []
+            skipped_users = []
+            self.start_quota_session()
             
             self.logger.info("=" * 60)
             self.logger.info(f"📋 ПЛАН: Обробити {total_users} користувачів послідовно")
@@ -1400,29 +1453,46 @@ class InstagramBotGui:
                     self.logger.info(f"👤 КОРИСТУВАЧ {user_index}/{total_users}: @{target_user}")
                     self.logger.info("🔹" * 60)
                     
+                    # Бюджет на користувачів (сесія/година/день)
+                    if not self.reserve_quota('user'):
+                        skipped_users.extend(target_users[user_index - 1:])
+                        break
+                    
                     # Виконуємо ВСІ дії для цього користувача
                     user_success = self.run_single_user_automation(target_user, messages, actions_config)
+                    limited = self.finish_target(target_user, user_success)
                     
                     if user_success:
                         successful_users += 1
                         self.logger.info(f"✅ Користувач @{target_user} оброблений УСПІШНО!")
+                    elif limited:
+                        skipped_users.append(target_user)
+                        self.logger.warning(f"⏭️ Обробку @{target_user} перервано лімітом")
                     else:
                         failed_users.append(target_user)
                         self.logger.warning(f"❌ Помилка при обробці @{target_user}")
                     
+                    # Бюджет дій вичерпано - зупинка без обробки решти
+                    if self.quota_exhausted():
+                        skipped_users.extend(target_users[user_index:])
+                        self.logger.warning(f"⛔ Зупинка: {self.quota.exhausted}")
+                        break
+                    
                     # Затримка між користувачами (крім останнього)
                     if user_index < total_users:
                         delay_time = random.uniform(30, 60)  # 30-60 секунд між користувачами
                         self.logger.info(f"⏳ Затримка {delay_time:.1f} сек. перед наступним користувачем...")
-                        time.sleep(delay_time)
+                        with self.profiler.span("user_delay", CATEGORY_SLEEP):
+                            time.sleep(delay_time)
                     
                 except Exception as e:
                     self.logger.error(f"❌ Критична помилка при обробці @{target_user}: {e}")
                     failed_users.append(target_user)
                     continue
             
-            # Підсумок роботи
-            success_rate = (successful_users / total_users) * 100
+            # Підсумок роботи (успішність - серед оброблених, без пропущених через ліміти)
+            processed_users = total_users - len(skipped_users)
+            success_rate = (successful_users / processed_users) * 100 if processed_users else 0
             
             self.logger.info("")
             self.logger.info("🔸" * 60)
@@ -1436,6 +1506,10 @@ class InstagramBotGui:
             if failed_users:
                 self.logger.info(f"❌ Користувачі з помилками: {', '.join(failed_users)}")
             
+            if skipped_users:
+                self.logger.info(f"⏭️ Пропущено через ліміти ({len(skipped_users)}): {', '.join(skipped_users)}")
+            self.logger.info(f"📉 Залишок лімітів: {self.quota.remaining()}")
+            
             if success_rate == 100:
                 self.logger.info("🎉 ВІДМІННО! Всі користувачі оброблені успішно!")
             elif success_rate >= 80:
@@ -1452,7 +1526,10 @@ class InstagramBotGui:
         except Exception as e:
             self.logger.error(f"❌ Критична помилка при багатокористувацькій автоматизації: {e}")
             return False
+        finally:
+            self.save_run_profile()
 
+    @timed_step()
     def run_single_user_automation(self, target_username, messages, actions_config=None):
         """Виконання повного циклу дій для ОДНОГО користувача"""
         try:
@@ -1490,7 +1567,9 @@ class InstagramBotGui:
             
             # 2. ЕТАП 2: Сторіс (якщо увімкнено)
             story_success = False
-            if actions_config.get('like_stories', True) or actions_config.get('reply_stories', True):
+            if self.quota_exhausted():
+                self.logger.warning("⛔ Ліміти вичерпано - решта етапів пропускається")
+            elif actions_config.get('like_stories', True) or actions_config.get('reply_stories', True):
                 self.logger.info("📱 === ЕТАП 2: СТОРІС (ЛАЙК + ВІДПОВІДЬ) ===")
                 try:
                     story_success = self.process_story_with_config(target_username, messages, actions_config)
@@ -1503,7 +1582,7 @@ class InstagramBotGui:
                     self.logger.error(f"❌ Помилка при роботі зі сторіс: {e}")
                     
             # 3. ЕТАП 3: Fallback - Direct Message (якщо увімкнено і сторіс не спрацювала)
-            if not story_success and actions_config.get('send_direct_message', True):
+            if not story_success and not self.quota_exhausted() and actions_config.get('send_direct_message', True):
                 self.logger.info("💬 === ЕТАП 3: FALLBACK - DIRECT MESSAGE ===")
                 self.human_like_delay(10, 15)
                 
@@ -1545,6 +1624,7 @@ class InstagramBotGui:
             self.logger.error(f"❌ Критична помилка для користувача @{target_username}: {e}")
             return False
 
+    @timed_step()
     def process_story_with_config(self, target_username, messages, actions_config):
         """Обробка сторіс з урахуванням конфігурації"""
         try:
@@ -1608,7 +1688,14 @@ class InstagramBotGui:
                             EC.presence_of_element_located((By.CSS_SELECTOR, selector))
                         )
                         if 'Unlike' not in (like_button.get_attribute('aria-label') or ''):
-                            like_button.click()
+                            if not self.reserve_quota('story_like'):
+                                break
+                            try:
+                                like_button.click()
+                            except Exception:
+                                self.commit_quota('story_like', False, target_username)
+                                raise
+                            self.commit_quota('story_like', True, target_username)
                             story_liked = True
                             story_actions_completed += 1
                             self.logger.info("❤️ Поставлено лайк сторіс")
@@ -1622,6 +1709,7 @@ class InstagramBotGui:
             # Відповідь на сторіс (якщо увімкнено)
             if actions_config.get('reply_stories', True):
                 story_replied = False
+                reply_reserved = False
                 reply_selectors = [
                     "textarea[placeholder*='Send message']",
                     "textarea[placeholder*='Reply']",
@@ -1634,6 +1722,9 @@ class InstagramBotGui:
                         reply_input = WebDriverWait(self.driver, 3).until(
                             EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                         )
+                        if not self.reserve_quota('story_reply'):
+                            break
+                        reply_reserved = True
                         message = random.choice(messages)
                         reply_input.clear()
                         
@@ -1722,10 +1813,15 @@ class InstagramBotGui:
                         
                         story_replied = True
                         story_actions_completed += 1
+                        self.commit_quota('story_reply', True, target_username)
+                        reply_reserved = False
                         self.logger.info(f"✅ Відправлено відповідь на сторіс: {message}")
                         break
                         
                     except Exception as e:
+                        if reply_reserved:
+                            self.commit_quota('story_reply', False, target_username)
+                            reply_reserved = False
                         continue
 
                 if not story_replied:
@@ -1763,14 +1859,24 @@ class InstagramBotGui:
             # Якщо передано один користувач як рядок
             if isinstance(target_username, str) and ',' not in target_username and ';' not in target_username and '\n' not in target_username:
                 self.logger.info(f"🚀 Початок автоматизації для {target_username}")
+                self.profiler.reset()
+                self.start_quota_session()
                 
-                # Вхід в систему
-                if not self.login():
-                    self.logger.error("❌ Помилка входу в систему")
-                    return False
-                
-                # Виконуємо для одного користувача
-                return self.run_single_user_automation(target_username, messages)
+                try:
+                    # Вхід в систему
+                    if not self.login():
+                        self.logger.error("❌ Помилка входу в систему")
+                        return False
+                    
+                    if not self.reserve_quota('user'):
+                        return False
+                    
+                    # Виконуємо для одного користувача
+                    success = self.run_single_user_automation(target_username, messages)
+                    self.finish_target(target_username, success)
+                    return success
+                finally:
+                    self.save_run_profile()
             else:
                 # Якщо передано багато користувачів, використовуємо новий метод  
                 return self.run_automation_multiple_users(target_username, messages)
@@ -1786,6 +1892,34 @@ class InstagramBotGui:
             except:
                 pass
             
+    def save_run_profile(self):
+        """Збереження профілю прогону (JSON/CSV) та звіт у логах (вкладка логів GUI)"""
+        settings = Config.PROFILING
+        if not settings.get("enabled", True):
+            return []
+            
+        try:
+            for line in self.profiler.format_report(settings.get("report_top", 10)):
+                self.logger.info(line)
+                
+            stamp = self.profiler.started_at.strftime("%Y%m%d_%H%M%S")
+            base_name = f"{self.username}_{stamp}"
+            output_dir = Path(settings["output_dir"])
+            
+            paths = []
+            if "json" in settings.get("formats", []):
+                paths.append(self.profiler.export_json(output_dir / f"{base_name}.json"))
+            if "csv" in settings.get("formats", []):
+                paths.append(self.profiler.export_csv(output_dir / f"{base_name}.csv"))
+                
+            if paths:
+                self.logger.info(f"📁 Профіль збережено: {', '.join(str(path) for path in paths)}")
+            return paths
+            
+        except Exception as e:
+            self.logger.error(f"❌ Помилка збереження профілю: {e}")
+            return []
+            
     def close(self):
         """Закриття бота"""
         if self.driver:
@@ -1796,6 +1930,10 @@ class InstagramBotGui:
         self.close()
 
 
+# Назва класу, під якою бота імпортують run.py та gui.py
+InstagramBot = InstagramBotGui
+
+
 # Приклад використання з багатьма користувачами
 if __name__ == "__main__":
     # Налаштування для роботи
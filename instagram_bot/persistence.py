@@ -0,0 +1,152 @@
+import os
+import json
+import shutil
+import atexit
+import logging
+import tempfile
+import threading
+from pathlib import Path
+
+
+def atomic_write_json(path, data, backup=False):
+    """Атомарний запис JSON: тимчасовий файл у тій же директорії + os.replace"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Попередня версія зберігається як <file>.backup
+        if backup and path.exists():
+            backup_path = path.with_name(path.name + ".backup")
+            backup_temp = backup_path.with_name(backup_path.name + ".tmp")
+            shutil.copy2(path, backup_temp)
+            os.replace(backup_temp, backup_path)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_json(path, default=None):
+    """Читання JSON з відновленням з .backup при пошкодженні"""
+    path = Path(path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except ValueError as e:
+        backup_path = path.with_name(path.name + ".backup")
+        logging.warning(f"Пошкоджений JSON {path}: {e}")
+        if backup_path.exists():
+            try:
+                with open(backup_path, 'r', encoding='utf-8') as f:
+                    logging.warning(f"Використано резервну копію {backup_path}")
+                    return json.load(f)
+            except ValueError:
+                pass
+        return default
+
+
+class JsonStore:
+    """JSON файл з кешем у пам'яті та відкладеним (об'єднаним) записом"""
+
+    def __init__(self, path, delay=0.5, backup=False, default=dict):
+        self.path = Path(path)
+        self.delay = delay
+        self.backup = backup
+        self.default = default
+        self._data = None
+        self._signature = None
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def _file_signature(self):
+        try:
+            stat = self.path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def load(self):
+        """Дані з кешу; файл перечитується лише якщо змінився на диску"""
+        with self._lock:
+            # Незаписані зміни мають пріоритет над файлом
+            if self._dirty:
+                return self._data
+
+            signature = self._file_signature()
+            if self._data is None or signature != self._signature:
+                data = read_json(self.path)
+                self._data = data if data is not None else self.default()
+                self._signature = signature
+
+            return self._data
+
+    def save(self, data=None):
+        """Планування запису; повторні виклики протягом delay об'єднуються"""
+        with self._lock:
+            if data is not None:
+                self._data = data
+            self._dirty = True
+
+            if self.delay <= 0:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Негайний запис незбережених змін"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if not self._dirty:
+                return
+
+            try:
+                atomic_write_json(self.path, self._data, backup=self.backup)
+                self._signature = self._file_signature()
+                self._dirty = False
+            except Exception as e:
+                logging.error(f"Помилка запису {self.path}: {e}")
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path, **kwargs):
+    """Спільний JsonStore для файлу (один кеш на шлях)"""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = JsonStore(path, **kwargs)
+            _stores[key] = store
+        return store
+
+
+def flush_all():
+    """Запис усіх відкладених змін (викликається при виході)"""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
+
+
+atexit.register(flush_all)
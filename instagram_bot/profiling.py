@@ -0,0 +1,184 @@
+import csv
+import json
+import time
+import functools
+from datetime import datetime
+from pathlib import Path
+from contextlib import contextmanager
+
+
+# Категорії спанів у звіті
+CATEGORY_STEP = "step"
+CATEGORY_PAGE_LOAD = "page_load"
+CATEGORY_WEBDRIVER = "webdriver"
+CATEGORY_SLEEP = "sleep"
+
+CSV_FIELDS = ["name", "category", "parent", "start", "duration", "error", "detail"]
+
+
+class RunProfiler:
+    """Легковаговий профайлер прогону: вкладені спани з часом виконання"""
+
+    def __init__(self, name="run"):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        """Початок нового прогону"""
+        self.started_at = datetime.now()
+        self._origin = time.perf_counter()
+        self._stack = []
+        self.spans = []
+
+    @contextmanager
+    def span(self, name, category=CATEGORY_STEP, detail=None):
+        """Замір блоку коду: with profiler.span("like_recent_posts"): ..."""
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(name)
+        error = None
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self._stack.pop()
+            self.spans.append({
+                "name": name,
+                "category": category,
+                "parent": parent,
+                "start": round(start - self._origin, 6),
+                "duration": round(duration, 6),
+                "error": error,
+                "detail": detail
+            })
+
+    def elapsed(self):
+        """Час від початку прогону (секунди)"""
+        return time.perf_counter() - self._origin
+
+    def category_totals(self):
+        """Сумарний час за категоріями (без спанів-кроків)"""
+        totals = {}
+        for span in self.spans:
+            if span["category"] != CATEGORY_STEP:
+                totals[span["category"]] = totals.get(span["category"], 0.0) + span["duration"]
+        return totals
+
+    def summary(self):
+        """Агрегати по (категорія, назва): кількість, сума, максимум"""
+        stats = {}
+        for span in self.spans:
+            key = (span["category"], span["name"])
+            entry = stats.setdefault(key, {"category": span["category"], "name": span["name"],
+                                           "count": 0, "total": 0.0, "max": 0.0, "errors": 0})
+            entry["count"] += 1
+            entry["total"] += span["duration"]
+            entry["max"] = max(entry["max"], span["duration"])
+            if span["error"]:
+                entry["errors"] += 1
+        return sorted(stats.values(), key=lambda entry: entry["total"], reverse=True)
+
+    def to_dict(self):
+        """Профіль у вигляді, придатному для JSON"""
+        return {
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "elapsed": round(self.elapsed(), 6),
+            "category_totals": {k: round(v, 6) for k, v in self.category_totals().items()},
+            "summary": self.summary(),
+            "spans": self.spans
+        }
+
+    def export_json(self, path):
+        """Запис профілю в JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        return path
+
+    def export_csv(self, path):
+        """Запис спанів у CSV (один рядок на спан)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.spans)
+        return path
+
+    def format_report(self, top=10):
+        """Текстовий звіт (рядки) для логів"""
+        elapsed = self.elapsed()
+        lines = [f"⏱️ Профіль прогону '{self.name}': {elapsed:.1f} сек"]
+
+        for category, total in sorted(self.category_totals().items(), key=lambda item: -item[1]):
+            share = (total / elapsed * 100) if elapsed else 0
+            lines.append(f"  • {category}: {total:.2f} сек ({share:.1f}%)")
+
+        lines.append("  Найдовші операції:")
+        for entry in self.summary()[:top]:
+            lines.append(
+                f"    {entry['total']:8.2f} сек  x{entry['count']:<5} "
+                f"(макс. {entry['max']:.2f})  [{entry['category']}] {entry['name']}"
+            )
+        return lines
+
+
+def _selector(args, kwargs):
+    """Селектор з аргументів find_element(by, value)"""
+    return kwargs.get("value", args[1] if len(args) > 1 else None)
+
+
+class InstrumentedDriver:
+    """Обгортка WebDriver, що замірює driver.get / find_element(s) / execute_script
+
+    Працює з будь-яким об'єктом з тими самими методами (зокрема зі
+    stub-драйвером без браузера). Решта атрибутів передається як є.
+    """
+
+    def __init__(self, driver, profiler):
+        self._driver = driver
+        self._profiler = profiler
+
+    @property
+    def wrapped_driver(self):
+        return self._driver
+
+    def get(self, url):
+        with self._profiler.span("driver.get", CATEGORY_PAGE_LOAD, detail=url):
+            return self._driver.get(url)
+
+    def find_element(self, *args, **kwargs):
+        with self._profiler.span("driver.find_element", CATEGORY_WEBDRIVER, detail=_selector(args, kwargs)):
+            return self._driver.find_element(*args, **kwargs)
+
+    def find_elements(self, *args, **kwargs):
+        with self._profiler.span("driver.find_elements", CATEGORY_WEBDRIVER, detail=_selector(args, kwargs)):
+            return self._driver.find_elements(*args, **kwargs)
+
+    def execute_script(self, script, *args):
+        with self._profiler.span("driver.execute_script", CATEGORY_WEBDRIVER):
+            return self._driver.execute_script(script, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+def timed_step(name=None):
+    """Декоратор методу бота: замір кроку через self.profiler"""
+    def decorator(method):
+        step_name = name or method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = getattr(self, "profiler", None)
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            with profiler.span(step_name, CATEGORY_STEP):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -13,55 +13,45 @@ import sys
 import os
 import logging
 import argparse
+import subprocess
 from pathlib import Path
 import traceback
+import importlib.util
 
 # Додавання поточної директорії до шляху
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+# GUI (tkinter), бот (Selenium) та utils імпортуються ліниво в тих функціях,
+# яким вони потрібні, щоб --help, --check та --cli не платили за зайві модулі
 try:
     from config import Config
-    from utils import setup_logging, create_directories
-    from gui import InstagramBotGUI
-    from instagram_bot import InstagramBot
 except ImportError as e:
     print(f"❌ Помилка імпорту: {e}")
     print("Переконайтесь, що всі необхідні файли присутні в директорії")
     sys.exit(1)
 
+# Модуль для імпорту -> назва пакету для pip
+REQUIRED_PACKAGES = {
+    'selenium': 'selenium',
+    'requests': 'requests',
+    'PIL': 'Pillow',
+    'cv2': 'opencv-python',
+    'numpy': 'numpy',
+    'matplotlib': 'matplotlib',
+    'pytesseract': 'pytesseract'
+}
+
+# Модулі, час імпорту яких показує --import-timing
+STARTUP_MODULES = ['config', 'utils', 'instagram_bot', 'gui']
+
 def check_requirements():
-    """Перевірка необхідних залежностей"""
-    required_packages = [
-        'selenium',
-        'requests',
-        'PIL',
-        'cv2',
-        'numpy',
-        'matplotlib',
-        'pytesseract'
+    """Перевірка необхідних залежностей (без імпорту самих пакетів)"""
+    missing_packages = [
+        pip_name for module, pip_name in REQUIRED_PACKAGES.items()
+        if importlib.util.find_spec(module) is None
     ]
     
-    missing_packages = []
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            # Спеціальні випадки для пакетів з різними назвами
-            if package == 'PIL':
-                try:
-                    __import__('Pillow')
-                except ImportError:
-                    missing_packages.append('Pillow')
-            elif package == 'cv2':
-                try:
-                    __import__('opencv-python')
-                except ImportError:
-                    missing_packages.append('opencv-python')
-            else:
-                missing_packages.append(package)
-    
     if missing_packages:
         print("❌ Відсутні необхідні пакети:")
         for package in missing_packages:
@@ -72,9 +62,72 @@ def check_requirements():
     
     return True
 
+def parse_import_times(stderr_output, module):
+    """Розбір python -X importtime: модулі, імпортовані через module
+
+    Повертає (cumulative_us модуля, [(назва, self_us, cumulative_us), ...]).
+    """
+    entries = []
+    for line in stderr_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # Рядок заголовка
+        name = parts[2].rstrip()
+        depth = len(name) - len(name.lstrip())
+        entries.append((name.strip(), self_us, cumulative_us, depth))
+    
+    for index, (name, _, cumulative_us, depth) in enumerate(entries):
+        if name != module:
+            continue
+        # Залежності модуля виводяться перед ним з більшим відступом
+        children = []
+        for child in reversed(entries[:index]):
+            if child[3] <= depth:
+                break
+            children.append(child[:3])
+        return cumulative_us, children
+    
+    return None, []
+
+def report_import_timing(top=15):
+    """Звіт про час імпорту модулів запуску на основі python -X importtime"""
+    print("⏱️ Час імпорту модулів (python -X importtime):")
+    
+    for module in STARTUP_MODULES:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=current_dir, capture_output=True, text=True
+        )
+        total_us, children = parse_import_times(result.stderr, module)
+        
+        if result.returncode != 0 or total_us is None:
+            error = result.stderr.strip().splitlines()[-1:] or ["невідома помилка"]
+            print(f"\n❌ {module}: не вдалося імпортувати ({error[0]})")
+            continue
+            
+        print(f"\n📦 {module}: {total_us / 1000:.1f} мс (залежностей: {len(children)})")
+        
+        slowest = sorted(children, key=lambda child: child[2], reverse=True)
+        for name, self_us, cumulative_us in slowest[:top]:
+            print(f"   {cumulative_us / 1000:8.1f} мс  (власний {self_us / 1000:6.1f} мс)  {name}")
+
 def check_chromedriver():
-    """Перевірка наявності ChromeDriver"""
+    """Перевірка наявності ChromeDriver (з кешем перевіреної пари в маніфесті)"""
     try:
+        from setup_chromedriver import (find_chromedriver, is_chromedriver_verified,
+                                        mark_chromedriver_verified)
+        
+        # Пара Chrome/ChromeDriver вже перевірялась і бінарники не змінились
+        driver_path = find_chromedriver()
+        if driver_path and is_chromedriver_verified(driver_path):
+            return True
+        
         from selenium import webdriver
         from selenium.webdriver.chrome.service import Service
         from selenium.webdriver.chrome.options import Options
@@ -86,15 +139,21 @@ def check_chromedriver():
         options.add_argument('--disable-dev-shm-usage')
         
         try:
-            driver = webdriver.Chrome(options=options)
+            if driver_path:
+                driver = webdriver.Chrome(service=Service(driver_path), options=options)
+            else:
+                driver = webdriver.Chrome(options=options)
             driver.quit()
-            return True
         except Exception:
             print("❌ ChromeDriver не знайдено або не працює")
             print("Завантажте ChromeDriver з https://chromedriver.chromium.org/")
             print("І додайте його до PATH або в директорію проекту")
             return False
             
+        if driver_path:
+            mark_chromedriver_verified(driver_path)
+        return True
+            
     except Exception as e:
         print(f"❌ Помилка перевірки ChromeDriver: {e}")
         return False
@@ -102,6 +161,8 @@ def check_chromedriver():
 def setup_environment():
     """Налаштування середовища"""
     try:
+        from utils import setup_logging, create_directories, start_retention_scheduler
+        
         # Створення необхідних директорій
         create_directories()
         
@@ -113,6 +174,9 @@ def setup_environment():
         if config_file.exists():
             Config.load_config(config_file)
             
+        # Очищення старих даних БД за розкладом
+        start_retention_scheduler()
+            
         logging.info("🚀 Instagram Bot запущено")
         logging.info(f"📁 Робоча директорія: {current_dir}")
         
@@ -127,6 +191,8 @@ def run_gui():
     """Запуск графічного інтерфейсу"""
     try:
         print("🎨 Запуск графічного інтерфейсу...")
+        from gui import InstagramBotGUI
+        
         app = InstagramBotGUI()
         app.run()
         
@@ -149,6 +215,8 @@ def run_cli(args):
             return False
             
         # Створення бота
+        from instagram_bot import InstagramBot
+        
         bot = InstagramBot(args.username, args.password, args.proxy)
         
         # Повідомлення для відповідей
@@ -216,6 +284,10 @@ def main():
                        help='Режим відладки')
     parser.add_argument('--check', action='store_true', 
                        help='Перевірка системи')
+    parser.add_argument('--import-timing', action='store_true',
+                       help='Звіт про час імпорту модулів (python -X importtime)')
+    parser.add_argument('--export-stats', nargs='?', const='', metavar='PATH',
+                       help='Експорт статистики з БД у JSON (за замовчуванням reports/statistics.json)')
     
     args = parser.parse_args()
     
@@ -231,6 +303,18 @@ def main():
     print("🤖 Instagram Bot - Мобільна автоматизація")
     print("=" * 50)
     
+    if args.import_timing:
+        report_import_timing()
+        return 0
+    
+    if args.export_stats is not None:
+        from utils import export_statistics
+        path = export_statistics(args.export_stats or None, args.username)
+        if not path:
+            return 1
+        print(f"📊 Статистику збережено: {path}")
+        return 0
+    
     # Перевірка системи
     if args.check:
         print("🔍 Перевірка системи...")
@@ -5,18 +5,196 @@
 """
 
 import os
+import re
 import sys
+import hashlib
 import platform
 import subprocess
-import requests
 import zipfile
 import tempfile
 import shutil
 from pathlib import Path
 
+from persistence import atomic_write_json, read_json
+
+
+# Директорія встановлених драйверів та маніфест з кешем версій
+INSTALL_DIR = Path.home() / '.chromedriver'
+MANIFEST_PATH = INSTALL_DIR / 'manifest.json'
+
+VERSION_PATTERN = re.compile(r'\d+(?:\.\d+)+')
+
+
+# === МАНІФЕСТ: КЕШ ВЕРСІЙ ТА ПЕРЕВІРЕНИХ ПАР CHROME/CHROMEDRIVER ===
+
+def load_manifest():
+    """Завантаження маніфесту"""
+    manifest = read_json(MANIFEST_PATH, default=None) or {}
+    manifest.setdefault('binaries', {})
+    manifest.setdefault('drivers', [])
+    manifest.setdefault('verified', None)
+    return manifest
+
+
+def save_manifest(manifest):
+    """Збереження маніфесту"""
+    try:
+        atomic_write_json(MANIFEST_PATH, manifest)
+    except Exception as e:
+        print(f"⚠️ Не вдалося зберегти маніфест ChromeDriver: {e}")
+
+
+def _file_stat(path):
+    """mtime та розмір файлу (ключ інвалідації кешу)"""
+    stat = os.stat(path)
+    return {'mtime': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def _file_sha256(path):
+    """Хеш файлу (рахується лише при зміні mtime/розміру)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cached_binary(manifest, path):
+    """Запис маніфесту для бінарника, якщо файл не змінився (запис без версії - промах)"""
+    entry = manifest['binaries'].get(str(path))
+    if not entry or not entry.get('version'):
+        return None
+    try:
+        stat = _file_stat(path)
+    except OSError:
+        return None
+    if entry.get('mtime') != stat['mtime'] or entry.get('size') != stat['size']:
+        return None
+    return entry
+
+
+def record_binary(manifest, path, version):
+    """Запис версії, mtime, розміру та хешу бінарника в маніфест"""
+    entry = _file_stat(path)
+    entry['version'] = version
+    entry['sha256'] = _file_sha256(path)
+    manifest['binaries'][str(path)] = entry
+    return entry
+
+
+def get_binary_version(path, manifest=None):
+    """Версія бінарника (<path> --version) з кешем у маніфесті"""
+    if manifest is None:
+        manifest = load_manifest()
+
+    cached = get_cached_binary(manifest, path)
+    if cached:
+        return cached['version']
+
+    try:
+        result = subprocess.run([str(path), '--version'],
+                                capture_output=True, text=True, check=True)
+        match = VERSION_PATTERN.search(result.stdout)
+    except Exception:
+        return None
+
+    if not match:
+        return None
+
+    record_binary(manifest, path, match.group(0))
+    save_manifest(manifest)
+    return match.group(0)
+
+
+def find_chrome_binary():
+    """Пошук виконуваного файлу Chrome"""
+    system = platform.system()
+
+    if system == "Windows":
+        possible_paths = [
+            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+            os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe")
+        ]
+    elif system == "Darwin":
+        possible_paths = ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+    else:
+        possible_paths = [shutil.which(name) for name in
+                          ('google-chrome', 'google-chrome-stable', 'chromium-browser', 'chromium')]
+
+    for path in possible_paths:
+        if path and os.path.exists(path):
+            return os.path.realpath(path)
+    return None
+
+
+def find_chromedriver():
+    """Пошук ChromeDriver: PATH, потім директорія встановлення"""
+    driver_path = shutil.which('chromedriver')
+    if not driver_path:
+        _, _, executable_name = get_platform_info()
+        candidate = INSTALL_DIR / executable_name
+        if candidate.exists():
+            driver_path = str(candidate)
+    return os.path.realpath(driver_path) if driver_path else None
+
+
+def is_chromedriver_verified(driver_path):
+    """Чи була пара Chrome/ChromeDriver вже перевірена і не змінилась з того часу"""
+    manifest = load_manifest()
+    verified = manifest.get('verified')
+    if not verified or verified.get('driver') != os.path.realpath(driver_path):
+        return False
+
+    chrome_path = verified.get('chrome')
+    if chrome_path and not get_cached_binary(manifest, chrome_path):
+        return False
+    return get_cached_binary(manifest, verified['driver']) is not None
+
+
+def mark_chromedriver_verified(driver_path):
+    """Запис успішно перевіреної пари Chrome/ChromeDriver"""
+    driver_path = os.path.realpath(driver_path)
+    chrome_path = find_chrome_binary()
+
+    # Версія Chrome - через get_chrome_version (на Windows реєстр замість
+    # chrome.exe --version); у маніфест потрапляють лише визначені версії
+    get_chrome_version()
+
+    manifest = load_manifest()
+    try:
+        get_binary_version(driver_path, manifest)
+    except OSError as e:
+        print(f"⚠️ Не вдалося записати маніфест: {e}")
+        return
+
+    manifest['verified'] = {'chrome': chrome_path, 'driver': driver_path}
+    save_manifest(manifest)
+
 
 def get_chrome_version():
-    """Отримання версії Chrome"""
+    """Отримання версії Chrome (з кешем у маніфесті)"""
+    chrome_path = find_chrome_binary()
+    manifest = load_manifest()
+    if chrome_path:
+        cached = get_cached_binary(manifest, chrome_path)
+        if cached:
+            return cached['version']
+
+    version = _detect_chrome_version()
+
+    if version and chrome_path:
+        try:
+            record_binary(manifest, chrome_path, version)
+            save_manifest(manifest)
+        except OSError:
+            pass
+
+    return version
+
+
+def _detect_chrome_version():
+    """Визначення версії Chrome через реєстр або виконання браузера"""
     try:
         if platform.system() == "Windows":
             # Спроба через реєстр
@@ -106,6 +284,8 @@ def get_platform_info():
 
 def download_chromedriver(version, platform_name, filename):
     """Завантаження ChromeDriver"""
+    import requests
+    
     try:
         # URL для Chrome for Testing
         base_url = "https://storage.googleapis.com/chrome-for-testing-public"
@@ -189,7 +369,7 @@ def install_chromedriver(chrome_version=None):
                 return False
             
             # Створення постійного розташування
-            install_dir = os.path.join(os.path.expanduser('~'), '.chromedriver')
+            install_dir = str(INSTALL_DIR)
             os.makedirs(install_dir, exist_ok=True)
             
             final_path = os.path.join(install_dir, executable_name)
@@ -201,10 +381,18 @@ def install_chromedriver(chrome_version=None):
             if platform.system() != "Windows":
                 os.chmod(final_path, 0o755)
             
+            # Реєстрація драйвера в маніфесті (для clean_old_drivers)
+            manifest = load_manifest()
+            if chrome_version:
+                record_binary(manifest, final_path, chrome_version)
+            if final_path not in manifest['drivers']:
+                manifest['drivers'].append(final_path)
+            save_manifest(manifest)
+            
             print(f"✅ ChromeDriver встановлено: {final_path}")
             
             # Тестування
-            if test_chromedriver(final_path):
+            if test_chromedriver(final_path, use_cache=False):
                 print("✅ ChromeDriver працює правильно!")
                 
                 # Додавання до PATH (опціонально)
@@ -222,9 +410,13 @@ def install_chromedriver(chrome_version=None):
         return False
 
 
-def test_chromedriver(driver_path):
-    """Тестування ChromeDriver"""
+def test_chromedriver(driver_path, use_cache=True):
+    """Тестування ChromeDriver (пропускається, якщо пара вже перевірена)"""
     try:
+        if use_cache and is_chromedriver_verified(driver_path):
+            print("✅ ChromeDriver вже перевірено (маніфест), запуск пропущено")
+            return True
+            
         print("🧪 Тестування ChromeDriver...")
         
         from selenium import webdriver
@@ -245,7 +437,11 @@ def test_chromedriver(driver_path):
         driver.quit()
         
         print(f"📝 Заголовок сторінки: {title}")
-        return "Google" in title
+        if "Google" not in title:
+            return False
+            
+        mark_chromedriver_verified(driver_path)
+        return True
         
     except Exception as e:
         print(f"❌ Помилка тестування: {e}")
@@ -313,8 +509,18 @@ def add_chromedriver_to_path(install_dir):
         print(f"❌ Помилка додавання до PATH: {e}")
 
 
+def installed_drivers(manifest):
+    """Драйвери з маніфесту плюс файли в INSTALL_DIR, встановлені до появи маніфесту"""
+    drivers = list(manifest['drivers'])
+    if INSTALL_DIR.is_dir():
+        for entry in INSTALL_DIR.iterdir():
+            if entry.is_file() and entry.name.startswith('chromedriver') and str(entry) not in drivers:
+                drivers.append(str(entry))
+    return drivers
+
+
 def clean_old_drivers():
-    """Очищення старих драйверів"""
+    """Очищення старих драйверів (з маніфесту та незареєстрованих у INSTALL_DIR)"""
     try:
         # Очищення webdriver-manager кешу
         wdm_cache = os.path.expanduser('~/.wdm')
@@ -322,12 +528,21 @@ def clean_old_drivers():
             shutil.rmtree(wdm_cache)
             print("🗑️ Очищено кеш webdriver-manager")
         
-        # Очищення нашого кешу
-        our_cache = os.path.expanduser('~/.chromedriver')
-        if os.path.exists(our_cache):
-            response = input(f"Видалити існуючі драйвери з {our_cache}? (y/n): ").lower().strip()
+        # Очищення нашого кешу за маніфестом
+        manifest = load_manifest()
+        drivers = [path for path in installed_drivers(manifest) if os.path.exists(path)]
+        if drivers:
+            response = input(f"Видалити існуючі драйвери ({len(drivers)}) з {INSTALL_DIR}? (y/n): ").lower().strip()
             if response == 'y':
-                shutil.rmtree(our_cache)
+                for path in drivers:
+                    os.remove(path)
+                    manifest['binaries'].pop(path, None)
+                    
+                manifest['drivers'] = []
+                verified = manifest.get('verified')
+                if verified and verified.get('driver') in drivers:
+                    manifest['verified'] = None
+                save_manifest(manifest)
                 print("🗑️ Очищено старі драйвери")
         
     except Exception as e:
@@ -378,7 +593,7 @@ def main():
                 print("❌ ChromeDriver не знайдено в PATH")
                 return
         
-        if test_chromedriver(driver_path):
+        if test_chromedriver(driver_path, use_cache=False):
             print("✅ ChromeDriver працює!")
         else:
             print("❌ ChromeDriver не працює")
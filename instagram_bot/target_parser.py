@@ -0,0 +1,143 @@
+import re
+from functools import lru_cache
+
+
+# Дозволені символи юзернейму Instagram
+DEFAULT_ALLOWED_CHARACTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._"
+
+# Будь-яка комбінація розділювачів: кома, крапка з комою, пробіли, табуляція, новий рядок
+SEPARATORS_PATTERN = re.compile(r'[,;\s]+')
+
+
+@lru_cache(maxsize=8)
+def _invalid_char_pattern(allowed_characters):
+    """Скомпільований шаблон першого недозволеного символу"""
+    return re.compile('[^' + re.escape(allowed_characters) + ']')
+
+
+@lru_cache(maxsize=8)
+def _username_pattern(allowed_characters, min_length, max_length, remove_at_symbol):
+    """Скомпільований шаблон валідного юзернейму (з опційними @ на початку)"""
+    prefix = '@*' if remove_at_symbol else ''
+    return re.compile(f"{prefix}([{re.escape(allowed_characters)}]{{{min_length},{max_length}}})")
+
+
+def validate_username(username, min_length=1, max_length=30,
+                      allowed_characters=DEFAULT_ALLOWED_CHARACTERS, remove_at_symbol=True):
+    """Валідація юзернейму: (True, username) або (False, причина)"""
+    if not username:
+        return False, "Порожній юзернейм"
+
+    # Видалення символу @
+    if remove_at_symbol:
+        username = username.lstrip('@')
+
+    # Перевірка довжини
+    if len(username) < min_length:
+        return False, f"Занадто короткий (мін. {min_length})"
+
+    if len(username) > max_length:
+        return False, f"Занадто довгий (макс. {max_length})"
+
+    # Перевірка дозволених символів
+    invalid = _invalid_char_pattern(allowed_characters).search(username)
+    if invalid:
+        return False, f"Недозволений символ: {invalid.group(0)}"
+
+    return True, username
+
+
+def parse_usernames(source, lowercase=True, remove_duplicates=True, min_length=1, max_length=30,
+                    allowed_characters=DEFAULT_ALLOWED_CHARACTERS, remove_at_symbol=True):
+    """Парсинг юзернеймів з рядка або ітератора рядків (файлу)
+
+    Повертає (валідні юзернейми, помилки "токен: причина").
+    """
+    if isinstance(source, str):
+        source = (source,)
+
+    match = _username_pattern(allowed_characters, min_length, max_length, remove_at_symbol).fullmatch
+    split = SEPARATORS_PATTERN.split
+    users = []
+    errors = []
+    seen = set()
+
+    for chunk in source:
+        for token in split(chunk):
+            if not token:
+                continue
+
+            matched = match(token)
+            if matched is None:
+                # Повільний шлях лише для невалідних - щоб отримати причину
+                reason = validate_username(token, min_length, max_length,
+                                           allowed_characters, remove_at_symbol)[1]
+                errors.append(f"{token}: {reason}")
+                continue
+
+            result = matched.group(1)
+            if lowercase:
+                result = result.lower()
+            if remove_duplicates:
+                if result in seen:
+                    continue
+                seen.add(result)
+            users.append(result)
+
+    return users, errors
+
+
+def parse_file(path, **options):
+    """Потоковий парсинг файлу (рядок за рядком, без читання файлу цілком)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_usernames(f, **options)
+
+
+class IncrementalTargetCounter:
+    """Лічильник унікальних валідних юзернеймів у тексті, що редагується
+
+    Новий текст порівнюється з попереднім по рядках: спільні початок і кінець
+    пропускаються, перепарсюються лише змінені рядки між ними.
+    """
+
+    def __init__(self, **options):
+        self.options = dict(options, remove_duplicates=False)
+        self._lines = []
+        self._line_users = []
+        self._counts = {}
+
+    def _update_counts(self, users_lists, delta):
+        counts = self._counts
+        for users in users_lists:
+            for user in users:
+                value = counts.get(user, 0) + delta
+                if value:
+                    counts[user] = value
+                else:
+                    del counts[user]
+
+    def count(self, text):
+        """Кількість унікальних валідних юзернеймів"""
+        old_lines = self._lines
+        new_lines = text.split('\n')
+
+        # Спільний початок
+        start = 0
+        limit = min(len(old_lines), len(new_lines))
+        while start < limit and old_lines[start] == new_lines[start]:
+            start += 1
+
+        # Спільний кінець
+        old_end = len(old_lines)
+        new_end = len(new_lines)
+        while old_end > start and new_end > start and old_lines[old_end - 1] == new_lines[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+
+        changed_users = [parse_usernames(line, **self.options)[0] for line in new_lines[start:new_end]]
+        self._update_counts(self._line_users[start:old_end], -1)
+        self._update_counts(changed_users, 1)
+
+        self._line_users[start:old_end] = changed_users
+        self._lines = new_lines
+        return len(self._counts)
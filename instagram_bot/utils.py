@@ -1,16 +1,15 @@
 import random
 import time
-import requests
 import sqlite3
 import json
-import cv2
-import numpy as np
-from PIL import Image
-import pytesseract
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
+import threading
+import queue
+import atexit
+from pathlib import Path
 from config import Config
+from persistence import atomic_write_json
 import logging
+import logging.handlers
 from datetime import datetime, timedelta
 import hashlib
 import base64
@@ -53,6 +52,8 @@ class ProxyManager:
     def test_proxy(self, proxy):
         """Тестування проксі"""
         try:
+            import requests
+            
             proxy_dict = {
                 'http': f'http://{proxy}',
                 'https': f'https://{proxy}'
@@ -97,6 +98,11 @@ class CaptchaSolver:
     def solve_local_captcha(self, image_path):
         """Локальне розпізнавання капчі"""
         try:
+            # OpenCV/Tesseract потрібні лише тут, тому імпортуються ліниво
+            import cv2
+            import numpy as np
+            import pytesseract
+            
             # Завантаження та обробка зображення
             image = cv2.imread(image_path)
             
@@ -142,6 +148,8 @@ class CaptchaSolver:
     def solve_2captcha(self, image_path):
         """Розв'язування через 2captcha"""
         try:
+            import requests
+            
             # Завантаження зображення
             with open(image_path, 'rb') as f:
                 image_data = base64.b64encode(f.read()).decode('utf-8')
@@ -185,6 +193,8 @@ class AntiDetection:
         
     def human_typing(self, element, text):
         """Імітація людського введення тексту"""
+        from selenium.webdriver.common.keys import Keys
+        
         element.clear()
         
         for char in text:
@@ -208,6 +218,8 @@ class AntiDetection:
     def random_mouse_movement(self, driver):
         """Рандомні рухи миші"""
         try:
+            from selenium.webdriver.common.action_chains import ActionChains
+            
             action = ActionChains(driver)
             
             # Генерація випадкових координат
@@ -265,17 +277,250 @@ class AntiDetection:
             logging.error(f"Помилка зміни viewport: {e}")
 
 class DatabaseManager:
-    """Менеджер бази даних"""
+    """Менеджер бази даних з одним постійним з'єднанням"""
     
-    def __init__(self):
-        self.db_path = Config.DATABASE["path"]
+    # Розмір пакету записів, що комітяться однією транзакцією
+    WRITE_BATCH_SIZE = 100
+    
+    # Поточна версія схеми (зберігається в PRAGMA user_version)
+    SCHEMA_VERSION = 3
+    
+    # Запити тримаються константами, щоб sqlite3 повторно використовував
+    # підготовлені (закешовані) оператори замість повторного компілювання
+    SQL_ADD_ACCOUNT = '''
+        INSERT OR REPLACE INTO accounts (username, password, proxy)
+        VALUES (?, ?, ?)
+    '''
+    SQL_GET_ACCOUNT = 'SELECT * FROM accounts WHERE username = ?'
+    SQL_GET_ALL_ACCOUNTS = 'SELECT * FROM accounts'
+    SQL_UPDATE_STATUS = '''
+        UPDATE accounts SET status = ?, last_activity = CURRENT_TIMESTAMP
+        WHERE username = ?
+    '''
+    SQL_LOG_ACTION = '''
+        INSERT INTO actions (account_username, action_type, target_username, success, details)
+        VALUES (?, ?, ?, ?, ?)
+    '''
+    SQL_COUNT_ACTION = '''
+        INSERT INTO daily_action_counts (account_username, date, action_type, count)
+        VALUES (?, DATE('now'), ?, 1)
+        ON CONFLICT (account_username, date, action_type)
+        DO UPDATE SET count = count + 1
+    '''
+    SQL_TODAY_ACTIONS = '''
+        SELECT action_type, count
+        FROM daily_action_counts
+        WHERE account_username = ? AND date = DATE('now')
+    '''
+    SQL_ACTIONS_IN_RANGE = '''
+        SELECT action_type, COUNT(*) as count
+        FROM actions
+        WHERE account_username = ? AND timestamp >= ? AND timestamp < ?
+        GROUP BY action_type
+    '''
+    SQL_SUCCESSFUL_ACTIONS_IN_RANGE = '''
+        SELECT action_type, COUNT(*) as count
+        FROM actions
+        WHERE account_username = ? AND timestamp >= ? AND timestamp < ? AND success
+        GROUP BY action_type
+    '''
+    SQL_EXPIRED_BATCH = '''
+        SELECT id FROM actions WHERE timestamp < ? ORDER BY id LIMIT ?
+    '''
+    SQL_DELETE_EXPIRED = '''
+        DELETE FROM actions WHERE id IN (''' + SQL_EXPIRED_BATCH + ''')
+    '''
+    STATISTICS_COLUMNS = ('likes_count', 'comments_count', 'follows_count',
+                          'stories_count', 'messages_count', 'users_count')
+    SQL_INCREMENT_STATISTICS = '''
+        INSERT INTO statistics (account_username, date, likes_count, comments_count,
+                                follows_count, stories_count, messages_count, users_count)
+        VALUES (?, DATE('now'), ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (account_username, date) DO UPDATE SET
+            likes_count = likes_count + excluded.likes_count,
+            comments_count = comments_count + excluded.comments_count,
+            follows_count = follows_count + excluded.follows_count,
+            stories_count = stories_count + excluded.stories_count,
+            messages_count = messages_count + excluded.messages_count,
+            users_count = users_count + excluded.users_count
+    '''
+    SQL_GET_STATISTICS = '''
+        SELECT likes_count, comments_count, follows_count,
+               stories_count, messages_count, users_count
+        FROM statistics
+        WHERE account_username = ? AND date = COALESCE(?, DATE('now'))
+    '''
+    SQL_RECENT_TARGETS = '''
+        SELECT COUNT(*) FROM target_statistics
+        WHERE account_username = ? AND last_seen >= ?
+    '''
+    SQL_RECORD_TARGET = '''
+        INSERT INTO target_statistics (account_username, target_username, visits_count, success_count)
+        VALUES (?, ?, 1, ?)
+        ON CONFLICT (account_username, target_username) DO UPDATE SET
+            visits_count = visits_count + 1,
+            success_count = success_count + excluded.success_count,
+            last_seen = CURRENT_TIMESTAMP
+    '''
+    # Денні рядки до початку місяця, що містить (сьогодні - N днів), згортаються по місяцях
+    SQL_COMPACTION_CUTOFF = "SELECT DATE('now', ?, 'start of month')"
+    SQL_COMPACT_STATISTICS = '''
+        INSERT INTO monthly_statistics (account_username, month, likes_count, comments_count,
+                                        follows_count, stories_count, messages_count, users_count)
+        SELECT account_username, strftime('%Y-%m', date),
+               SUM(likes_count), SUM(comments_count), SUM(follows_count),
+               SUM(stories_count), SUM(messages_count), SUM(users_count)
+        FROM statistics
+        WHERE date < ?
+        GROUP BY account_username, strftime('%Y-%m', date)
+        ON CONFLICT (account_username, month) DO UPDATE SET
+            likes_count = likes_count + excluded.likes_count,
+            comments_count = comments_count + excluded.comments_count,
+            follows_count = follows_count + excluded.follows_count,
+            stories_count = stories_count + excluded.stories_count,
+            messages_count = messages_count + excluded.messages_count,
+            users_count = users_count + excluded.users_count
+    '''
+    SQL_DELETE_COMPACTED = 'DELETE FROM statistics WHERE date < ?'
+    SQL_COUNT_OUTCOME = '''
+        INSERT INTO action_statistics (account_username, hour, action_type,
+                                       successful_count, failed_count, last_action)
+        VALUES (?, strftime('%Y-%m-%d %H:00', 'now'), ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT (account_username, hour, action_type) DO UPDATE SET
+            successful_count = successful_count + excluded.successful_count,
+            failed_count = failed_count + excluded.failed_count,
+            last_action = excluded.last_action
+    '''
+    SQL_COMPACT_OUTCOMES = '''
+        INSERT INTO monthly_action_statistics (account_username, month, action_type,
+                                               successful_count, failed_count, last_action)
+        SELECT account_username, substr(hour, 1, 7), action_type,
+               SUM(successful_count), SUM(failed_count), MAX(last_action)
+        FROM action_statistics
+        WHERE hour < ?
+        GROUP BY account_username, substr(hour, 1, 7), action_type
+        ON CONFLICT (account_username, month, action_type) DO UPDATE SET
+            successful_count = successful_count + excluded.successful_count,
+            failed_count = failed_count + excluded.failed_count,
+            last_action = MAX(last_action, excluded.last_action)
+    '''
+    SQL_DELETE_COMPACTED_OUTCOMES = 'DELETE FROM action_statistics WHERE hour < ?'
+    SQL_SAVE_FOLLOWERS = 'UPDATE accounts SET followers_count = ? WHERE username = ?'
+    SQL_GET_FOLLOWERS = 'SELECT followers_count FROM accounts WHERE username = ?'
+    
+    def __init__(self, db_path=None):
+        self.db_path = db_path or Config.DATABASE["path"]
+        self._lock = threading.RLock()
+        self._write_queue = queue.Queue()
+        self._closed = False
+        self.conn = self._connect()
         self.init_database()
         
+        # Окремий потік-записувач: GUI потік і основний потік лише ставлять
+        # записи в чергу і не чекають на fsync
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True,
+                                        name="DatabaseWriter")
+        self._writer.start()
+        atexit.register(self.close)
+        
+    def _connect(self):
+        """Відкриття постійного з'єднання в режимі WAL"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=128)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+        
+    def _writer_loop(self):
+        """Обробка черги записів пакетами"""
+        while True:
+            item = self._write_queue.get()
+            batch = [item]
+            while item is not None and len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+                
+            statements = [entry for entry in batch if entry is not None]
+            try:
+                if statements:
+                    with self._lock:
+                        self._write_batch(statements)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+                    
+            if len(statements) != len(batch):
+                return
+                
+    def _write_batch(self, statements):
+        """Пакет записів однією транзакцією; при помилці - повтор по одному"""
+        try:
+            with self.conn:
+                for sql, params in statements:
+                    self.conn.execute(sql, params)
+            return
+        except Exception:
+            pass
+            
+        # Пакет відкочено цілком: по одному, щоб втратити лише хибні записи інших викликів
+        for sql, params in statements:
+            try:
+                with self.conn:
+                    self.conn.execute(sql, params)
+            except Exception as e:
+                logging.error(f"Помилка запису в БД: {e}")
+                
+    def _enqueue_write(self, sql, params=()):
+        """Постановка запису в чергу (без очікування коміту)"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("DatabaseManager закрито")
+        self._write_queue.put((sql, params))
+        
+    def _execute_write(self, sql, params=()):
+        """Синхронний запис з комітом"""
+        self.flush()
+        with self._lock:
+            with self.conn:
+                return self.conn.execute(sql, params)
+                
+    def _query(self, sql, params=()):
+        """Читання (усі рядки) після застосування всіх записів з черги"""
+        self.flush()
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+            
+    def _query_one(self, sql, params=()):
+        """Читання одного рядка після застосування всіх записів з черги"""
+        self.flush()
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()
+            
+    def flush(self):
+        """Очікування запису всіх дій з черги"""
+        if not self._closed:
+            self._write_queue.join()
+            
+    def close(self):
+        """Запис черги та закриття з'єднання"""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._write_queue.put(None)
+        self._writer.join(timeout=5)
+        with self._lock:
+            self.conn.close()
+        atexit.unregister(self.close)
+        
     def init_database(self):
         """Ініціалізація бази даних"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._lock:
+                cursor = self.conn.cursor()
                 
                 # Таблиця акаунтів
                 cursor.execute('''
@@ -334,22 +579,132 @@ class DatabaseManager:
                     )
                 ''')
                 
-                conn.commit()
+                self.conn.commit()
+                
+            self.migrate_database()
                 
         except Exception as e:
             logging.error(f"Помилка ініціалізації БД: {e}")
             
+    def migrate_database(self):
+        """Міграція схеми існуючих файлів БД до SCHEMA_VERSION"""
+        migrations = {
+            1: self._migrate_to_1,
+            2: self._migrate_to_2,
+            3: self._migrate_to_3,
+        }
+        
+        with self._lock:
+            version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+            
+            for target_version in range(version + 1, self.SCHEMA_VERSION + 1):
+                with self.conn:
+                    migrations[target_version](self.conn)
+                    self.conn.execute(f'PRAGMA user_version = {target_version}')
+                logging.info(f"БД мігровано до версії схеми {target_version}")
+                
+    def _migrate_to_1(self, conn):
+        """Індекс (account_username, timestamp) та таблиця денних лічильників"""
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_actions_account_timestamp
+            ON actions (account_username, timestamp)
+        ''')
+        
+        # Лічильник виконаних дій на акаунт/день/тип, щоб перевірка лімітів не сканувала actions
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS daily_action_counts (
+                account_username TEXT NOT NULL,
+                date DATE NOT NULL,
+                action_type TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (account_username, date, action_type)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Заповнення лічильників з уже накопичених дій
+        conn.execute('''
+            INSERT OR REPLACE INTO daily_action_counts (account_username, date, action_type, count)
+            SELECT account_username, DATE(timestamp), action_type, COUNT(*)
+            FROM actions
+            WHERE account_username IS NOT NULL AND action_type IS NOT NULL AND success
+            GROUP BY account_username, DATE(timestamp), action_type
+        ''')
+            
+    def _migrate_to_2(self, conn):
+        """Лічильники повідомлень та оброблених користувачів у statistics"""
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(statistics)')}
+        for column in ('messages_count', 'users_count'):
+            if column not in columns:
+                conn.execute(f'ALTER TABLE statistics ADD COLUMN {column} INTEGER DEFAULT 0')
+            
+    def _migrate_to_3(self, conn):
+        """Агрегати по цільових користувачах, погодинні агрегати дій та місячні зведення"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS target_statistics (
+                account_username TEXT NOT NULL,
+                target_username TEXT NOT NULL,
+                visits_count INTEGER NOT NULL DEFAULT 0,
+                success_count INTEGER NOT NULL DEFAULT 0,
+                first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (account_username, target_username)
+            ) WITHOUT ROWID
+        ''')
+        
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS monthly_statistics (
+                account_username TEXT NOT NULL,
+                month TEXT NOT NULL,
+                likes_count INTEGER DEFAULT 0,
+                comments_count INTEGER DEFAULT 0,
+                follows_count INTEGER DEFAULT 0,
+                stories_count INTEGER DEFAULT 0,
+                messages_count INTEGER DEFAULT 0,
+                users_count INTEGER DEFAULT 0,
+                PRIMARY KEY (account_username, month)
+            ) WITHOUT ROWID
+        ''')
+        
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS action_statistics (
+                account_username TEXT NOT NULL,
+                hour TEXT NOT NULL,
+                action_type TEXT NOT NULL,
+                successful_count INTEGER NOT NULL DEFAULT 0,
+                failed_count INTEGER NOT NULL DEFAULT 0,
+                last_action TIMESTAMP,
+                PRIMARY KEY (account_username, hour, action_type)
+            ) WITHOUT ROWID
+        ''')
+        
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS monthly_action_statistics (
+                account_username TEXT NOT NULL,
+                month TEXT NOT NULL,
+                action_type TEXT NOT NULL,
+                successful_count INTEGER NOT NULL DEFAULT 0,
+                failed_count INTEGER NOT NULL DEFAULT 0,
+                last_action TIMESTAMP,
+                PRIMARY KEY (account_username, month, action_type)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Заповнення погодинних агрегатів з уже накопичених дій
+        conn.execute('''
+            INSERT OR REPLACE INTO action_statistics (account_username, hour, action_type,
+                                                      successful_count, failed_count, last_action)
+            SELECT account_username, strftime('%Y-%m-%d %H:00', timestamp), action_type,
+                   SUM(success = 1), SUM(success != 1), MAX(timestamp)
+            FROM actions
+            WHERE account_username IS NOT NULL AND action_type IS NOT NULL
+            GROUP BY account_username, strftime('%Y-%m-%d %H:00', timestamp), action_type
+        ''')
+            
     def add_account(self, username, password, proxy=None):
         """Додавання акаунта"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO accounts (username, password, proxy)
-                    VALUES (?, ?, ?)
-                ''', (username, password, proxy))
-                conn.commit()
-                return True
+            self._execute_write(self.SQL_ADD_ACCOUNT, (username, password, proxy))
+            return True
                 
         except Exception as e:
             logging.error(f"Помилка додавання акаунта: {e}")
@@ -358,12 +713,7 @@ class DatabaseManager:
     def get_account(self, username):
         """Отримання акаунта"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM accounts WHERE username = ?
-                ''', (username,))
-                return cursor.fetchone()
+            return self._query_one(self.SQL_GET_ACCOUNT, (username,))
                 
         except Exception as e:
             logging.error(f"Помилка отримання акаунта: {e}")
@@ -372,10 +722,7 @@ class DatabaseManager:
     def get_all_accounts(self):
         """Отримання всіх акаунтів"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT * FROM accounts')
-                return cursor.fetchall()
+            return self._query(self.SQL_GET_ALL_ACCOUNTS)
                 
         except Exception as e:
             logging.error(f"Помилка отримання акаунтів: {e}")
@@ -384,29 +731,23 @@ class DatabaseManager:
     def update_account_status(self, username, status):
         """Оновлення статусу акаунта"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE accounts SET status = ?, last_activity = CURRENT_TIMESTAMP
-                    WHERE username = ?
-                ''', (status, username))
-                conn.commit()
-                return True
+            self._execute_write(self.SQL_UPDATE_STATUS, (status, username))
+            return True
                 
         except Exception as e:
             logging.error(f"Помилка оновлення статусу: {e}")
             return False
             
     def log_action(self, account_username, action_type, target_username=None, success=True, details=None):
-        """Логування дії"""
+        """Логування дії (асинхронно через чергу записів)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO actions (account_username, action_type, target_username, success, details)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (account_username, action_type, target_username, success, details))
-                conn.commit()
+            self._enqueue_write(self.SQL_LOG_ACTION,
+                                (account_username, action_type, target_username, success, details))
+            # Денні лічильники рахують лише виконані дії, погодинні - обидва результати
+            if success:
+                self._enqueue_write(self.SQL_COUNT_ACTION, (account_username, action_type))
+            self._enqueue_write(self.SQL_COUNT_OUTCOME,
+                                (account_username, action_type, 1 if success else 0, 0 if success else 1))
                 
         except Exception as e:
             logging.error(f"Помилка логування дії: {e}")
@@ -414,29 +755,157 @@ class DatabaseManager:
     def get_today_actions(self, account_username):
         """Отримання дій за сьогодні"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT action_type, COUNT(*) as count
-                    FROM actions
-                    WHERE account_username = ? AND DATE(timestamp) = DATE('now')
-                    GROUP BY action_type
-                ''', (account_username,))
-                return dict(cursor.fetchall())
+            return dict(self._query(self.SQL_TODAY_ACTIONS, (account_username,)))
                 
         except Exception as e:
             logging.error(f"Помилка отримання дій: {e}")
             return {}
             
+    def get_actions_in_range(self, account_username, start, end, successful_only=False):
+        """Кількість дій за типами в інтервалі [start, end) (UTC) по індексу actions"""
+        try:
+            params = (account_username,
+                      start.strftime('%Y-%m-%d %H:%M:%S'),
+                      end.strftime('%Y-%m-%d %H:%M:%S'))
+            sql = self.SQL_SUCCESSFUL_ACTIONS_IN_RANGE if successful_only else self.SQL_ACTIONS_IN_RANGE
+            return dict(self._query(sql, params))
+                
+        except Exception as e:
+            logging.error(f"Помилка отримання дій: {e}")
+            return {}
+            
+    def increment_statistics(self, account_username, likes=0, comments=0, follows=0,
+                             stories=0, messages=0, users=0):
+        """Інкремент денних лічильників у statistics (асинхронно через чергу записів)"""
+        try:
+            self._enqueue_write(self.SQL_INCREMENT_STATISTICS,
+                                (account_username, likes, comments, follows, stories, messages, users))
+                
+        except Exception as e:
+            logging.error(f"Помилка оновлення статистики: {e}")
+            
+    def get_statistics(self, account_username, date=None):
+        """Денні лічильники зі statistics (за замовчуванням - сьогодні, UTC)"""
+        try:
+            row = self._query_one(self.SQL_GET_STATISTICS, (account_username, date))
+            return dict(zip(self.STATISTICS_COLUMNS, row or (0,) * len(self.STATISTICS_COLUMNS)))
+                
+        except Exception as e:
+            logging.error(f"Помилка отримання статистики: {e}")
+            return dict.fromkeys(self.STATISTICS_COLUMNS, 0)
+            
+    def record_target(self, account_username, target_username, success):
+        """Інкремент агрегату по цільовому користувачу (замість списку всіх звернень)"""
+        try:
+            self._enqueue_write(self.SQL_RECORD_TARGET,
+                                (account_username, target_username, 1 if success else 0))
+                
+        except Exception as e:
+            logging.error(f"Помилка запису цільового користувача: {e}")
+            
+    def count_recent_targets(self, account_username, since):
+        """Кількість цільових користувачів, оброблених після since (UTC)"""
+        try:
+            params = (account_username, since.strftime('%Y-%m-%d %H:%M:%S'))
+            return self._query_one(self.SQL_RECENT_TARGETS, params)[0]
+                
+        except Exception as e:
+            logging.error(f"Помилка отримання цільових користувачів: {e}")
+            return 0
+            
+    def compact_statistics(self, keep_days=None):
+        """Згортання старих рядків statistics/action_statistics у місячні таблиці"""
+        if keep_days is None:
+            keep_days = Config.DATABASE.get("retention", {}).get("statistics_days", 90)
+            
+        try:
+            self.flush()
+            with self._lock:
+                cutoff = self.conn.execute(self.SQL_COMPACTION_CUTOFF, (f'-{keep_days} days',)).fetchone()[0]
+                with self.conn:
+                    self.conn.execute(self.SQL_COMPACT_STATISTICS, (cutoff,))
+                    compacted = self.conn.execute(self.SQL_DELETE_COMPACTED, (cutoff,)).rowcount
+                    self.conn.execute(self.SQL_COMPACT_OUTCOMES, (cutoff,))
+                    compacted += self.conn.execute(self.SQL_DELETE_COMPACTED_OUTCOMES, (cutoff,)).rowcount
+                    
+            if compacted:
+                logging.info(f"🗜️ Статистика: {compacted} записів до {cutoff} згорнуто по місяцях")
+            return compacted
+                
+        except Exception as e:
+            logging.error(f"Помилка згортання статистики: {e}")
+            return 0
+            
+    def get_statistics_report(self, account_username=None):
+        """Статистика у форматі statistics.json, зібрана з агрегатів у БД
+        
+        Години - UTC. Періоди, старші за statistics_days, згорнуті по місяцях
+        і подаються в monthly_stats замість daily_stats/hourly_stats.
+        """
+        account_filter = ' WHERE account_username = ?' if account_username else ''
+        params = (account_username,) if account_username else ()
+        
+        def counters():
+            return {"total_actions": 0, "successful_actions": 0, "failed_actions": 0}
+            
+        def add(entry, successful, failed):
+            entry["total_actions"] += successful + failed
+            entry["successful_actions"] += successful
+            entry["failed_actions"] += failed
+            
+        report = {"accounts": {}, "daily_stats": {}, "monthly_stats": {}, "hourly_stats": {}}
+        report.update(counters())
+        report["start_time"] = None
+        
+        def add_outcome(username, period_stats, period, action_type, successful, failed, last_action):
+            account = report["accounts"].setdefault(username, dict(
+                counters(), actions_by_type={}, last_action=None, targets=[]))
+            add(account, successful, failed)
+            by_type = account["actions_by_type"].setdefault(
+                action_type, {"total": 0, "successful": 0, "failed": 0})
+            by_type["total"] += successful + failed
+            by_type["successful"] += successful
+            by_type["failed"] += failed
+            if last_action and (account["last_action"] is None or last_action > account["last_action"]):
+                account["last_action"] = last_action
+                
+            period_entry = period_stats.setdefault(period, dict(counters(), actions_by_type={}))
+            add(period_entry, successful, failed)
+            period_entry["actions_by_type"][action_type] = (
+                period_entry["actions_by_type"].get(action_type, 0) + successful + failed)
+            add(report, successful, failed)
+            
+        try:
+            for username, month, action_type, successful, failed, last_action in self._query(
+                    'SELECT account_username, month, action_type, successful_count, failed_count, last_action '
+                    f'FROM monthly_action_statistics{account_filter} ORDER BY month', params):
+                add_outcome(username, report["monthly_stats"], month, action_type,
+                            successful, failed, last_action)
+                report["start_time"] = report["start_time"] or month
+                
+            for username, hour, action_type, successful, failed, last_action in self._query(
+                    'SELECT account_username, hour, action_type, successful_count, failed_count, last_action '
+                    f'FROM action_statistics{account_filter} ORDER BY hour', params):
+                add_outcome(username, report["daily_stats"], hour[:10], action_type,
+                            successful, failed, last_action)
+                add(report["hourly_stats"].setdefault(hour, counters()), successful, failed)
+                report["start_time"] = report["start_time"] or hour
+                
+            for username, target in self._query(
+                    f'SELECT account_username, target_username FROM target_statistics{account_filter} '
+                    'ORDER BY first_seen', params):
+                if username in report["accounts"]:
+                    report["accounts"][username]["targets"].append(target)
+                    
+        except Exception as e:
+            logging.error(f"Помилка формування звіту статистики: {e}")
+            
+        return report
+            
     def save_followers_count(self, username, count):
         """Збереження кількості підписників"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE accounts SET followers_count = ? WHERE username = ?
-                ''', (count, username))
-                conn.commit()
+            self._enqueue_write(self.SQL_SAVE_FOLLOWERS, (count, username))
                 
         except Exception as e:
             logging.error(f"Помилка збереження кількості підписників: {e}")
@@ -444,40 +913,143 @@ class DatabaseManager:
     def get_followers_count(self, username):
         """Отримання кількості підписників"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT followers_count FROM accounts WHERE username = ?
-                ''', (username,))
-                result = cursor.fetchone()
-                return result[0] if result else None
+            result = self._query_one(self.SQL_GET_FOLLOWERS, (username,))
+            return result[0] if result else None
                 
         except Exception as e:
             logging.error(f"Помилка отримання кількості підписників: {e}")
             return None
             
-    def cleanup_old_data(self, days=30):
-        """Очищення старих даних"""
+    def cleanup_old_data(self, days=None, batch_size=None, pause=None):
+        """Пакетне очищення старих даних"""
+        retention = Config.DATABASE.get("retention", {})
+        if days is None:
+            days = retention.get("days", 30)
+        if batch_size is None:
+            batch_size = retention.get("batch_size", 500)
+        if pause is None:
+            pause = retention.get("batch_pause", 0.05)
+            
+        report = {
+            "deleted": 0,
+            "batches": 0,
+            "elapsed": 0.0,
+            "rows_per_sec": 0.0,
+            "lock_hold_total": 0.0,
+            "lock_hold_max": 0.0
+        }
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            self.flush()
+            cutoff = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+            params = (cutoff, batch_size)
+            started = time.perf_counter()
+            
+            while True:
+                # Кожен пакет - окрема коротка транзакція, між пакетами лок відпускається
+                with self._lock:
+                    lock_started = time.perf_counter()
+                    with self.conn:
+                        deleted = self.conn.execute(self.SQL_DELETE_EXPIRED, params).rowcount
+                    lock_held = time.perf_counter() - lock_started
+                    
+                report["lock_hold_total"] += lock_held
+                report["lock_hold_max"] = max(report["lock_hold_max"], lock_held)
                 
-                # Видалення старих дій
-                cursor.execute('''
-                    DELETE FROM actions
-                    WHERE timestamp < datetime('now', '-{} days')
-                '''.format(days))
+                if deleted <= 0:
+                    break
+                    
+                report["deleted"] += deleted
+                report["batches"] += 1
                 
-                # Видалення старих сесій
-                cursor.execute('''
-                    DELETE FROM sessions
-                    WHERE expires_at < datetime('now')
-                ''')
+                if deleted < batch_size:
+                    break
+                time.sleep(pause)
+                
+            with self._lock:
+                with self.conn:
+                    # Старі денні лічильники
+                    self.conn.execute('''
+                        DELETE FROM daily_action_counts WHERE date < DATE(?)
+                    ''', (cutoff,))
+                    
+                    # Видалення старих сесій
+                    self.conn.execute('''
+                        DELETE FROM sessions
+                        WHERE expires_at < datetime('now')
+                    ''')
+                    
+            report["elapsed"] = time.perf_counter() - started
+            if report["elapsed"] > 0:
+                report["rows_per_sec"] = report["deleted"] / report["elapsed"]
                 
-                conn.commit()
+            logging.info(
+                f"🧹 Очищення БД: видалено {report['deleted']} дій за {report['batches']} пакетів, "
+                f"{report['rows_per_sec']:.0f} рядків/сек, "
+                f"лок макс. {report['lock_hold_max'] * 1000:.1f} мс "
+                f"(всього {report['lock_hold_total'] * 1000:.1f} мс)"
+            )
                 
         except Exception as e:
             logging.error(f"Помилка очищення даних: {e}")
+            
+        return report
+
+class RetentionScheduler:
+    """Періодичний запуск очищення старих даних у фоновому потоці"""
+    
+    def __init__(self, db, interval_hours=None):
+        self.db = db
+        retention = Config.DATABASE.get("retention", {})
+        self.interval = (interval_hours or retention.get("interval_hours", 24)) * 3600
+        self.last_report = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        
+    def start(self):
+        """Запуск планувальника"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="RetentionScheduler")
+        self._thread.start()
+        
+    def stop(self):
+        """Зупинка планувальника"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            
+    def _run(self):
+        """Цикл: очищення одразу після старту, далі кожні interval секунд"""
+        while not self._stop_event.is_set():
+            self.last_report = self.db.cleanup_old_data()
+            self.db.compact_statistics()
+            self._stop_event.wait(self.interval)
+
+def export_statistics(path=None, account_username=None, db=None):
+    """Експорт статистики з БД у JSON на вимогу (атомарний запис)"""
+    try:
+        if path is None:
+            path = Path(Config.REPORTING["export_path"]) / "statistics.json"
+        report = (db or DatabaseManager()).get_statistics_report(account_username)
+        atomic_write_json(path, report)
+        logging.info(f"📊 Статистику експортовано: {path}")
+        return path
+        
+    except Exception as e:
+        logging.error(f"Помилка експорту статистики: {e}")
+        return None
+
+def start_retention_scheduler(db=None):
+    """Запуск очищення за розкладом з Config.DATABASE['retention']"""
+    retention = Config.DATABASE.get("retention", {})
+    if not retention.get("enabled", False):
+        return None
+        
+    scheduler = RetentionScheduler(db or DatabaseManager())
+    scheduler.start()
+    return scheduler
 
 class SecurityManager:
     """Менеджер безпеки"""
@@ -487,21 +1059,18 @@ class SecurityManager:
         self.db = DatabaseManager()
         
     def can_perform_action(self, username, action_type):
-        """Перевірка можливості виконання дії"""
+        """Перевірка денного та погодинного лімітів дій за поточними даними БД"""
         try:
+            # Ліміти ті ж, що в QuotaEngine, але без кешу: бот міг щойно витратити бюджет
             today_actions = self.db.get_today_actions(username)
-            
-            # Перевірка лімітів
-            if action_type == 'like' and today_actions.get('like', 0) >= self.action_limits['max_actions_per_day']:
-                return False
-                
-            if action_type == 'comment' and today_actions.get('comment', 0) >= Config.MAX_COMMENTS_PER_SESSION:
-                return False
-                
-            if action_type == 'follow' and today_actions.get('follow', 0) >= Config.MAX_FOLLOWS_PER_SESSION:
+            if (self.action_limits.get('enforce_daily_limits', True)
+                    and sum(today_actions.values()) >= self.action_limits['max_actions_per_day']):
                 return False
                 
-            return True
+            now = datetime.utcnow()
+            last_hour = self.db.get_actions_in_range(username, now - timedelta(hours=1),
+                                                     now + timedelta(seconds=1), successful_only=True)
+            return sum(last_hour.values()) < self.action_limits['max_actions_per_hour']
             
         except Exception as e:
             logging.error(f"Помилка перевірки лімітів: {e}")
@@ -523,6 +1092,180 @@ class SecurityManager:
         
         return (min_delay * multiplier, max_delay * multiplier)
 
+class TokenBucket:
+    """Token bucket: capacity токенів, поповнення capacity за period секунд"""
+    
+    def __init__(self, capacity, period, tokens=None):
+        self.capacity = capacity
+        self.refill_rate = capacity / period if period else 0
+        self.tokens = capacity if tokens is None else max(0.0, min(capacity, tokens))
+        self.updated = time.monotonic()
+        
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+        
+    def available(self):
+        """Кількість доступних токенів"""
+        self._refill()
+        return self.tokens
+        
+    def consume(self, amount=1):
+        """Списання токенів (False, якщо їх недостатньо)"""
+        self._refill()
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+        
+    def refund(self, amount=1):
+        """Повернення невикористаних токенів"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+class QuotaEngine:
+    """Єдиний облік лімітів дій акаунта (сесія, година, день)
+    
+    Лічильники тримаються в пам'яті (перевірка - O(1)), денні значення
+    підтягуються з таблиці statistics при старті і записуються туди ж.
+    Дія спершу резервується (reserve), а після виконання фіксується
+    з фактичним результатом (commit) - невдалі дії резерв повертають.
+    """
+    
+    # Тип дії -> колонка statistics (аргумент increment_statistics)
+    ACTION_STATISTICS = {
+        'like': 'likes',
+        'story_like': 'likes',
+        'story_reply': 'stories',
+        'direct_message': 'messages',
+        'comment': 'comments',
+        'follow': 'follows',
+        'user': 'users'
+    }
+    
+    def __init__(self, username, db=None):
+        self.username = username
+        self.db = db or DatabaseManager()
+        self.exhausted = None
+        self.reset_session()
+        self._load_daily()
+        
+        # Погодинні ліміти: виконані дії (actions) та оброблені користувачі (target_statistics)
+        since = datetime.utcnow() - timedelta(hours=1)
+        recent_actions = sum(self.db.get_actions_in_range(username, since,
+                                                          datetime.utcnow() + timedelta(seconds=1),
+                                                          successful_only=True).values())
+        recent_users = self.db.count_recent_targets(username, since)
+        self.hourly_actions = TokenBucket(Config.SECURITY['max_actions_per_hour'], 3600,
+                                          Config.SECURITY['max_actions_per_hour'] - recent_actions)
+        self.hourly_users = TokenBucket(Config.SECURITY['max_users_per_hour'], 3600,
+                                        Config.SECURITY['max_users_per_hour'] - recent_users)
+        
+    def reset_session(self):
+        """Початок нової сесії (ліміти на сесію обнуляються)"""
+        self.session_counts = {}
+        self.exhausted = None
+        
+    def _load_daily(self):
+        """Денні лічильники з таблиці statistics"""
+        self.day = datetime.utcnow().date()
+        stats = self.db.get_statistics(self.username)
+        self.daily_users = stats['users_count']
+        self.daily_actions = sum(value for column, value in stats.items() if column != 'users_count')
+        
+    def _session_limit(self, action):
+        if action == 'user':
+            return min(Config.MAX_USERS_PER_SESSION, Config.SECURITY['max_users_per_session'])
+        if action in ('like', 'story_like'):
+            return Config.MAX_LIKES_PER_SESSION
+        if action == 'comment':
+            return Config.MAX_COMMENTS_PER_SESSION
+        if action == 'follow':
+            return Config.MAX_FOLLOWS_PER_SESSION
+        return None
+        
+    def _session_count(self, action):
+        if action in ('like', 'story_like'):
+            return self.session_counts.get('like', 0) + self.session_counts.get('story_like', 0)
+        return self.session_counts.get(action, 0)
+        
+    def check(self, action):
+        """Перевірка без списання: (True, None) або (False, причина)"""
+        if datetime.utcnow().date() != self.day:
+            self._load_daily()
+            
+        session_limit = self._session_limit(action)
+        if session_limit is not None and self._session_count(action) >= session_limit:
+            return False, f"ліміт '{action}' за сесію ({session_limit})"
+            
+        if action == 'user':
+            if Config.SECURITY.get('enforce_daily_limits', True) and self.daily_users >= Config.MAX_USERS_PER_DAY:
+                return False, f"ліміт користувачів за день ({Config.MAX_USERS_PER_DAY})"
+            if self.hourly_users.available() < 1:
+                return False, f"ліміт користувачів за годину ({Config.SECURITY['max_users_per_hour']})"
+            return True, None
+            
+        daily_limit = Config.SECURITY['max_actions_per_day']
+        if Config.SECURITY.get('enforce_daily_limits', True) and self.daily_actions >= daily_limit:
+            return False, f"ліміт дій за день ({daily_limit})"
+        if self.hourly_actions.available() < 1:
+            return False, f"ліміт дій за годину ({Config.SECURITY['max_actions_per_hour']})"
+        return True, None
+        
+    def _consume(self, action, amount):
+        """Зміна лічильників у пам'яті (amount=-1 - повернення резерву)"""
+        if action == 'user':
+            bucket = self.hourly_users
+            self.daily_users += amount
+        else:
+            bucket = self.hourly_actions
+            self.daily_actions += amount
+            
+        if amount > 0:
+            bucket.consume(amount)
+        else:
+            bucket.refund(-amount)
+        self.session_counts[action] = self.session_counts.get(action, 0) + amount
+        
+    def reserve(self, action):
+        """Резерв квоти перед дією; False - бюджет вичерпано (прогін слід зупинити)"""
+        allowed, reason = self.check(action)
+        if not allowed:
+            self.exhausted = reason
+            return False
+            
+        self._consume(action, 1)
+        return True
+        
+    def commit(self, action, success, target_username=None, details=None):
+        """Фіксація результату зарезервованої дії
+        
+        Виконана дія пишеться в actions і statistics, невдала - лише в actions
+        (success=0) з поверненням резерву. Користувачі ('user') в actions не
+        пишуться: їх облік - statistics.users_count та target_statistics.
+        """
+        if not success:
+            self._consume(action, -1)
+            
+        if action != 'user':
+            self.db.log_action(self.username, action, target_username, success, details)
+            
+        column = self.ACTION_STATISTICS.get(action)
+        if success and column:
+            self.db.increment_statistics(self.username, **{column: 1})
+        
+    def remaining(self):
+        """Залишок бюджетів (для логів)"""
+        return {
+            'session_likes': Config.MAX_LIKES_PER_SESSION - self._session_count('like'),
+            'session_users': self._session_limit('user') - self._session_count('user'),
+            'daily_actions': Config.SECURITY['max_actions_per_day'] - self.daily_actions,
+            'daily_users': Config.MAX_USERS_PER_DAY - self.daily_users,
+            'hourly_actions': int(self.hourly_actions.available()),
+            'hourly_users': int(self.hourly_users.available())
+        }
+
 class MessageManager:
     """Менеджер повідомлень"""
     
@@ -568,19 +1311,118 @@ class MessageManager:
         except Exception as e:
             logging.error(f"Помилка збереження повідомлень: {e}")
 
+# Центральне логування: записи з усіх потоків йдуть у чергу, а файли
+# та консоль обслуговує окремий потік QueueListener
+_log_listener = None
+_log_lock = threading.Lock()
+
+ACCOUNT_LOGGER_PREFIX = "InstagramBot"
+
+def _create_file_handler(path):
+    """Файловий обробник з ротацією за розміром або за часом"""
+    settings = Config.LOGGING
+    
+    if not settings.get("file_rotation", True):
+        return logging.FileHandler(path, encoding='utf-8')
+        
+    if settings.get("rotation_when"):
+        return logging.handlers.TimedRotatingFileHandler(
+            path,
+            when=settings["rotation_when"],
+            backupCount=settings.get("backup_count", 5),
+            encoding='utf-8'
+        )
+        
+    return logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=settings.get("max_file_size", 10 * 1024 * 1024),
+        backupCount=settings.get("backup_count", 5),
+        encoding='utf-8'
+    )
+
+class AccountLogRouter(logging.Handler):
+    """Запис логів акаунтів у окремі файли logs/<username>_bot.log"""
+    
+    def __init__(self):
+        super().__init__()
+        self.handlers = {}
+        
+    def emit(self, record):
+        prefix = ACCOUNT_LOGGER_PREFIX + "."
+        if not record.name.startswith(prefix):
+            return
+            
+        username = record.name[len(prefix):].split('.')[0]
+        handler = self.handlers.get(username)
+        if handler is None:
+            handler = _create_file_handler(Config.LOGS_DIR / f"{username}_bot.log")
+            handler.setFormatter(self.formatter)
+            self.handlers[username] = handler
+            
+        handler.handle(record)
+        
+    def close(self):
+        for handler in self.handlers.values():
+            handler.close()
+        self.handlers.clear()
+        super().close()
+
 def setup_logging():
-    """Налаштування логування"""
-    log_format = Config.LOGGING["format"]
-    log_level = getattr(logging, Config.LOGGING["level"])
+    """Налаштування логування (один раз на процес)"""
+    global _log_listener
     
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(Config.LOGS_DIR / "app.log", encoding='utf-8'),
+    with _log_lock:
+        if _log_listener is not None:
+            return _log_listener
+            
+        log_level = getattr(logging, Config.LOGGING["level"])
+        formatter = logging.Formatter(Config.LOGGING["format"])
+        Config.LOGS_DIR.mkdir(exist_ok=True)
+        
+        handlers = [
+            _create_file_handler(Config.LOGS_DIR / "app.log"),
             logging.StreamHandler()
         ]
-    )
+        if Config.LOGGING.get("separate_user_logs", False):
+            handlers.append(AccountLogRouter())
+            
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            
+        log_queue = queue.Queue(-1)
+        root_logger = logging.getLogger()
+        root_logger.setLevel(log_level)
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        
+        _log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+        _log_listener.start()
+        atexit.register(shutdown_logging)
+        
+        return _log_listener
+
+def shutdown_logging():
+    """Запис залишку черги логів та закриття файлів"""
+    global _log_listener
+    
+    with _log_lock:
+        if _log_listener is None:
+            return
+            
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+            
+        root_logger = logging.getLogger()
+        for handler in list(root_logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                root_logger.removeHandler(handler)
+                
+        _log_listener = None
+
+def get_account_logger(username):
+    """Дочірній логер для акаунта (InstagramBot.<username>)"""
+    setup_logging()
+    return logging.getLogger(f"{ACCOUNT_LOGGER_PREFIX}.{username}")
 
 def create_directories():
     """Створення необхідних директорій"""